@@ -0,0 +1,135 @@
+"""
+Utilitários compartilhados pelos benchmarks do backend.
+
+Os scripts deste pacote são executados a partir da pasta ``backend``:
+
+    python -m benchmarks.<nome> --help
+"""
+
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+
+def setup_django(settings_module=None):
+    """Configura o Django para uso fora do manage.py"""
+    backend_dir = Path(__file__).resolve().parent.parent
+    if str(backend_dir) not in sys.path:
+        sys.path.insert(0, str(backend_dir))
+
+    if settings_module:
+        os.environ['DJANGO_SETTINGS_MODULE'] = settings_module
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+
+    import django
+    django.setup()
+
+
+def create_benchmark_database():
+    """
+    Cria um banco descartável (arquivo SQLite temporário ou banco de teste
+    do backend configurado) e aplica as migrations.
+
+    Retorna uma função que destrói o banco ao final.
+    """
+    from django.db import connection
+
+    settings_dict = connection.settings_dict
+    if connection.vendor == 'sqlite':
+        # Banco em arquivo: o SQLite em memória não suporta escrita concorrente
+        handle, path = tempfile.mkstemp(prefix='pets-bench-', suffix='.sqlite3')
+        os.close(handle)
+        settings_dict['TEST']['NAME'] = path
+        settings_dict.setdefault('OPTIONS', {}).setdefault('timeout', 30)
+
+    old_name = settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+    def destroy():
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    return destroy
+
+
+class QueryCounter:
+    """Conta as queries executadas em todas as conexões do processo"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        with self._lock:
+            self.count += 1
+        return execute(sql, params, many, context)
+
+    def install(self):
+        """Registra o contador nas conexões atuais e nas futuras"""
+        from django.db import connections
+        from django.db.backends.signals import connection_created
+
+        for conn in connections.all(initialized_only=True):
+            self._attach(conn)
+        connection_created.connect(self._on_connection_created, weak=False)
+
+    def _on_connection_created(self, sender, connection, **kwargs):
+        self._attach(connection)
+
+    def _attach(self, conn):
+        if self not in conn.execute_wrappers:
+            conn.execute_wrappers.append(self)
+
+    def reset(self):
+        with self._lock:
+            value, self.count = self.count, 0
+        return value
+
+
+def percentile(sorted_values, pct):
+    """Percentil pelo método nearest-rank (``sorted_values`` já ordenado)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def latency_summary(latencies):
+    """Resumo de latências em milissegundos"""
+    values = sorted(latencies)
+    return {
+        'p50_ms': round(percentile(values, 50) * 1000, 3),
+        'p95_ms': round(percentile(values, 95) * 1000, 3),
+        'p99_ms': round(percentile(values, 99) * 1000, 3),
+        'max_ms': round(values[-1] * 1000, 3) if values else 0.0,
+    }
+
+
+def environment_info():
+    """Metadados do ambiente para tornar os resultados comparáveis"""
+    import django
+    from django.conf import settings
+    from django.db import connection
+
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'platform': platform.platform(),
+        'settings': settings.SETTINGS_MODULE,
+        'database': connection.vendor,
+    }
+
+
+def write_json(path, payload):
+    """Grava resultados em JSON (``-`` escreve no stdout)"""
+    data = json.dumps(payload, indent=2, ensure_ascii=False)
+    if path == '-':
+        print(data)
+    else:
+        Path(path).write_text(data + '\n', encoding='utf-8')
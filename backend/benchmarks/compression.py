@@ -0,0 +1,151 @@
+"""
+Benchmark da compressão de respostas e dos estáticos pré-comprimidos.
+
+Respostas dinâmicas: mede bytes economizados e CPU por resposta do
+``CompressionMiddleware`` (gzip e, se instalado, brotli) para o schema
+OpenAPI e uma listagem JSON grande.
+
+Estáticos: roda o ``collectstatic`` em uma pasta temporária e compara o custo
+único de gravar os irmãos ``.br``/``.gz`` com o custo que cada requisição
+pagaria comprimindo os mesmos arquivos na hora.
+
+    python -m benchmarks.compression --iterations 200
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from benchmarks.common import environment_info, setup_django, write_json
+
+
+def per_call_us(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return round((time.perf_counter() - start) / iterations * 1_000_000, 3)
+
+
+def sample_payloads():
+    """Corpos representativos das respostas da API"""
+    from django.test import Client
+
+    schema = Client().get('/api/schema/', {'format': 'json'}, SERVER_NAME='localhost', HTTP_ACCEPT_ENCODING='identity')
+    if schema.status_code != 200 or 'json' not in schema['Content-Type']:
+        raise RuntimeError(f"/api/schema/ respondeu {schema.status_code} ({schema['Content-Type']})")
+    users = [
+        {
+            'id': index,
+            'username': f'usuario{index}',
+            'email': f'usuario{index}@example.com',
+            'first_name': 'Nome',
+            'last_name': 'Sobrenome',
+            'is_active': True,
+            'date_joined': '2025-01-01T12:00:00Z',
+        }
+        for index in range(500)
+    ]
+    return {
+        'openapi_schema': schema.content,
+        'user_list_json': json.dumps(users).encode(),
+    }
+
+
+def bench_dynamic(iterations):
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+
+    from users.compression import CompressionMiddleware, available_encodings
+
+    factory = RequestFactory()
+    results = []
+    for name, body in sample_payloads().items():
+        for encoding in available_encodings():
+            request = factory.get('/', HTTP_ACCEPT_ENCODING=encoding)
+            middleware = CompressionMiddleware(lambda request: HttpResponse(body, content_type='application/json'))
+            compressed = middleware(request)
+            results.append({
+                'payload': name,
+                'encoding': encoding,
+                'original_bytes': len(body),
+                'compressed_bytes': len(compressed.content),
+                'saved_pct': round((1 - len(compressed.content) / len(body)) * 100, 1),
+                'cpu_us': per_call_us(lambda: middleware(request), iterations),
+            })
+    return results
+
+
+def bench_static():
+    from django.core.management import call_command
+    from django.test import override_settings
+
+    from users.compression import SUFFIXES, STATIC_EXTENSIONS, available_encodings, compress
+
+    static_root = tempfile.mkdtemp(prefix='pets-static-')
+    try:
+        with override_settings(STATIC_ROOT=static_root):
+            call_command('collectstatic', interactive=False, verbosity=0, post_process=False, stdout=io.StringIO())
+            start = time.perf_counter()
+            call_command('collectstatic', interactive=False, verbosity=0, stdout=io.StringIO())
+            first_run = time.perf_counter() - start
+            # Nenhum arquivo mudou: o collectstatic seguinte não recomprime nada
+            start = time.perf_counter()
+            call_command('collectstatic', interactive=False, verbosity=0, stdout=io.StringIO())
+            second_run = time.perf_counter() - start
+
+        totals = {'files': 0, 'original_bytes': 0, 'on_the_fly_cpu_ms': {}}
+        totals.update({f'{encoding}_bytes': 0 for encoding in available_encodings()})
+        for directory, _, files in os.walk(static_root):
+            for filename in files:
+                path = os.path.join(directory, filename)
+                if not filename.endswith(STATIC_EXTENSIONS):
+                    continue
+                with open(path, 'rb') as original:
+                    data = original.read()
+                totals['files'] += 1
+                totals['original_bytes'] += len(data)
+                for encoding in available_encodings():
+                    sibling = path + SUFFIXES[encoding]
+                    totals[f'{encoding}_bytes'] += os.path.getsize(sibling) if os.path.exists(sibling) else len(data)
+                    start = time.perf_counter()
+                    compress(data, encoding)
+                    cpu = totals['on_the_fly_cpu_ms'].get(encoding, 0) + (time.perf_counter() - start) * 1000
+                    totals['on_the_fly_cpu_ms'][encoding] = cpu
+    finally:
+        shutil.rmtree(static_root, ignore_errors=True)
+
+    for encoding in available_encodings():
+        totals[f'{encoding}_saved_pct'] = round((1 - totals[f'{encoding}_bytes'] / totals['original_bytes']) * 100, 1)
+        totals['on_the_fly_cpu_ms'][encoding] = round(totals['on_the_fly_cpu_ms'][encoding], 3)
+    totals['precompress_seconds'] = round(first_run, 3)
+    totals['recollect_seconds'] = round(second_run, 3)
+    return totals
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', help='Módulo de settings')
+    parser.add_argument('--iterations', type=int, default=200, help='Compressões medidas por payload')
+    parser.add_argument('--output', default='-')
+    args = parser.parse_args(argv)
+
+    setup_django(args.settings)
+
+    from users.compression import available_encodings
+
+    write_json(args.output, {
+        'environment': environment_info(),
+        'config': {'iterations': args.iterations, 'encodings': list(available_encodings())},
+        'dynamic': bench_dynamic(args.iterations),
+        'static': bench_static(),
+    })
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Benchmark da autenticação JWT com tokens repetidos.
+
+Simula poucos clientes enviando o mesmo access token muitas vezes e compara
+o ``JWTAuthentication`` do simplejwt com o ``CachedJWTAuthentication``:
+só a validação do token e a autenticação completa (que inclui carregar o
+usuário do banco).
+
+    python -m benchmarks.jwt_auth --tokens 10 --iterations 20000
+"""
+
+import argparse
+import sys
+import time
+
+from benchmarks.common import create_benchmark_database, environment_info, setup_django, write_json
+
+
+def per_call_us(func, samples):
+    start = time.perf_counter()
+    for sample in samples:
+        func(sample)
+    return round((time.perf_counter() - start) / len(samples) * 1_000_000, 3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', help='Módulo de settings')
+    parser.add_argument('--tokens', type=int, default=10, help='Tokens distintos (clientes)')
+    parser.add_argument('--iterations', type=int, default=20000, help='Requisições autenticadas medidas')
+    parser.add_argument('--output', default='-')
+    args = parser.parse_args(argv)
+
+    setup_django(args.settings)
+
+    from django.contrib.auth import get_user_model
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication
+    from rest_framework_simplejwt.tokens import RefreshToken
+
+    from users.authentication import CachedJWTAuthentication, token_cache
+
+    destroy_database = create_benchmark_database()
+    try:
+        User = get_user_model()
+        factory = APIRequestFactory()
+        raw_tokens, requests_ = [], []
+        for index in range(args.tokens):
+            user = User.objects.create_user(username=f'jwt_bench_{index}', email=f'jwt_bench_{index}@example.com')
+            access = str(RefreshToken.for_user(user).access_token)
+            raw_tokens.append(access.encode())
+            requests_.append(Request(factory.get('/api/profile/', HTTP_AUTHORIZATION=f'Bearer {access}')))
+
+        token_samples = [raw_tokens[index % args.tokens] for index in range(args.iterations)]
+        request_samples = [requests_[index % args.tokens] for index in range(args.iterations)]
+
+        results = {}
+        for name, authentication in (('simplejwt', JWTAuthentication()), ('cached', CachedJWTAuthentication())):
+            token_cache.clear()
+            results[name] = {
+                'validate_token_us': per_call_us(authentication.get_validated_token, token_samples),
+                'authenticate_us': per_call_us(authentication.authenticate, request_samples),
+            }
+    finally:
+        destroy_database()
+
+    results['saved_per_request_us'] = round(
+        results['simplejwt']['authenticate_us'] - results['cached']['authenticate_us'], 3
+    )
+    write_json(args.output, {
+        'environment': environment_info(),
+        'config': {'tokens': args.tokens, 'iterations': args.iterations},
+        'results': results,
+    })
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
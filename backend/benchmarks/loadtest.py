@@ -0,0 +1,448 @@
+"""
+Teste de carga ponta a ponta da API de autenticação.
+
+Executa os cenários de registro, login, refresh de token, perfil, atualização
+de perfil, dashboard e ``google_auth`` (contra um servidor Google falso local)
+com concorrência configurável, tanto pelo entry point WSGI (``core/wsgi.py``)
+quanto pelo ASGI (``core/asgi.py``). Para cada cenário reporta throughput,
+latências p50/p95/p99 e queries por requisição.
+
+Exemplos:
+
+    python -m benchmarks.loadtest
+    python -m benchmarks.loadtest --concurrency 1,8,32 --requests 500 --output results.json
+    python -m benchmarks.loadtest --baseline results-v1.json --threshold 0.15
+
+Com ``--baseline`` o script compara os resultados e termina com código 1 se
+algum cenário regrediu além do limite.
+"""
+
+import argparse
+import asyncio
+import io
+import itertools
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+from benchmarks.common import (
+    QueryCounter,
+    create_benchmark_database,
+    environment_info,
+    latency_summary,
+    setup_django,
+    write_json,
+)
+
+SCENARIOS = ('register', 'login', 'refresh', 'profile', 'profile_update', 'dashboard', 'google_auth')
+ENTRYPOINTS = ('wsgi', 'asgi')
+PASSWORD = 'Bench-pass-123'
+
+
+# ============================================
+# SERVIDOR GOOGLE FALSO
+# ============================================
+class FakeGoogleHandler(BaseHTTPRequestHandler):
+    """Simula os endpoints de token e userinfo do Google"""
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        form = parse_qs(self.rfile.read(length).decode())
+        code = form.get('code', [''])[0]
+        self._send_json({'access_token': f'token-{code}', 'expires_in': 3600})
+
+    def do_GET(self):
+        token = self.headers.get('Authorization', '').removeprefix('Bearer ')
+        code = token.removeprefix('token-')
+        self._send_json({
+            'id': f'google-{code}',
+            'email': f'{code}@bench.example.com',
+            'name': f'Bench {code}',
+            'given_name': 'Bench',
+            'family_name': code,
+        })
+
+    def _send_json(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_fake_google():
+    """Sobe o servidor Google falso e aponta as settings para ele"""
+    from django.conf import settings
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGoogleHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    settings.GOOGLE_TOKEN_URL = f'{base_url}/token'
+    settings.GOOGLE_USERINFO_URL = f'{base_url}/userinfo'
+    google = settings.SOCIALACCOUNT_PROVIDERS['google']
+    if not google.get('APP', {}).get('client_id'):
+        google['APP'] = {'client_id': 'bench-client-id', 'secret': 'bench-secret', 'key': ''}
+    return server
+
+
+# ============================================
+# CENÁRIOS
+# ============================================
+class Fixtures:
+    """Usuários e tokens pré-criados usados pelos cenários"""
+
+    def __init__(self, pool_size):
+        from django.contrib.auth import get_user_model
+        from rest_framework_simplejwt.tokens import RefreshToken
+
+        User = get_user_model()
+        self.users = []
+        self.access = []
+        self.refresh = []
+        for index in range(pool_size):
+            user = User.objects.create_user(
+                username=f'bench_user_{index}',
+                email=f'bench_user_{index}@example.com',
+                password=PASSWORD,
+            )
+            refresh = RefreshToken.for_user(user)
+            self.users.append(user)
+            self.access.append(str(refresh.access_token))
+            self.refresh.append(str(refresh))
+        self._sequence = itertools.count()
+
+    def next_id(self):
+        return next(self._sequence)
+
+
+def build_request(scenario, fixtures, index):
+    """Retorna (método, path, corpo, headers, status esperado) da requisição"""
+    slot = index % len(fixtures.users)
+    bearer = {'Authorization': f'Bearer {fixtures.access[slot]}'}
+
+    if scenario == 'register':
+        unique = fixtures.next_id()
+        return 'POST', '/api/auth/registration/', {
+            'username': f'bench_reg_{unique}',
+            'email': f'bench_reg_{unique}@example.com',
+            'password1': PASSWORD,
+            'password2': PASSWORD,
+        }, {}, 201
+    if scenario == 'login':
+        return 'POST', '/api/auth/login/', {
+            'email': fixtures.users[slot].email,
+            'password': PASSWORD,
+        }, {}, 200
+    if scenario == 'refresh':
+        return 'POST', '/api/auth/token/refresh/', {'refresh': fixtures.refresh[slot]}, {}, 200
+    if scenario == 'profile':
+        return 'GET', '/api/profile/', None, bearer, 200
+    if scenario == 'profile_update':
+        return 'PATCH', '/api/profile/update/', {'first_name': f'Nome {index}'}, bearer, 200
+    if scenario == 'dashboard':
+        return 'GET', '/api/dashboard/', None, bearer, 200
+    if scenario == 'google_auth':
+        # Metade primeiro login, metade login recorrente
+        code = f'g{fixtures.next_id()}' if index % 2 else f'g-recurring-{slot}'
+        return 'POST', '/api/auth/google/callback/', {
+            'code': code,
+            'redirect_uri': 'http://localhost:3000/auth/google/callback',
+        }, {}, 200
+    raise ValueError(f'Cenário desconhecido: {scenario}')
+
+
+# ============================================
+# DRIVERS WSGI / ASGI
+# ============================================
+def call_wsgi(application, method, path, body, headers):
+    payload = json.dumps(body).encode() if body is not None else b''
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': '',
+        'SCRIPT_NAME': '',
+        'SERVER_NAME': 'localhost',
+        'SERVER_PORT': '80',
+        'SERVER_PROTOCOL': 'HTTP/1.1',
+        'REMOTE_ADDR': '127.0.0.1',
+        'HTTP_HOST': 'localhost',
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(payload)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': 'http',
+        'wsgi.input': io.BytesIO(payload),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for name, value in headers.items():
+        environ['HTTP_' + name.upper().replace('-', '_')] = value
+
+    status_holder = []
+
+    def start_response(status, response_headers, exc_info=None):
+        status_holder.append(int(status.split(' ', 1)[0]))
+
+    result = application(environ, start_response)
+    try:
+        for _chunk in result:
+            pass
+    finally:
+        if hasattr(result, 'close'):
+            result.close()
+    return status_holder[0]
+
+
+async def call_asgi(application, method, path, body, headers):
+    payload = json.dumps(body).encode() if body is not None else b''
+    raw_headers = [
+        (b'host', b'localhost'),
+        (b'content-type', b'application/json'),
+        (b'content-length', str(len(payload)).encode()),
+    ]
+    raw_headers += [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': b'',
+        'root_path': '',
+        'headers': raw_headers,
+        'client': ('127.0.0.1', 50000),
+        'server': ('localhost', 80),
+    }
+    body_sent = False
+    status_holder = []
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {'type': 'http.request', 'body': payload, 'more_body': False}
+        # O cliente nunca desconecta; o handler cancela esta espera ao terminar
+        await asyncio.Future()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status_holder.append(message['status'])
+
+    await application(scope, receive, send)
+    return status_holder[0]
+
+
+def run_wsgi(application, requests_, concurrency):
+    def timed(request):
+        method, path, body, headers, expected = request
+        start = time.perf_counter()
+        status_code = call_wsgi(application, method, path, body, headers)
+        return time.perf_counter() - start, status_code == expected
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(timed, requests_))
+    return results, time.perf_counter() - started
+
+
+def run_asgi(application, requests_, concurrency):
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def timed(request):
+            method, path, body, headers, expected = request
+            async with semaphore:
+                start = time.perf_counter()
+                status_code = await call_asgi(application, method, path, body, headers)
+                return time.perf_counter() - start, status_code == expected
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(timed(request) for request in requests_))
+        return results, time.perf_counter() - started
+
+    return asyncio.run(main())
+
+
+# ============================================
+# EXECUÇÃO
+# ============================================
+def run_scenario(entrypoint, application, scenario, fixtures, counter, total, concurrency, warmup):
+    runner = run_wsgi if entrypoint == 'wsgi' else run_asgi
+
+    if warmup:
+        runner(application, [build_request(scenario, fixtures, i) for i in range(warmup)], concurrency)
+
+    requests_ = [build_request(scenario, fixtures, i) for i in range(total)]
+    counter.reset()
+    results, elapsed = runner(application, requests_, concurrency)
+    queries = counter.reset()
+
+    latencies = [latency for latency, _ok in results]
+    errors = sum(1 for _latency, ok in results if not ok)
+    return {
+        'entrypoint': entrypoint,
+        'scenario': scenario,
+        'concurrency': concurrency,
+        'requests': total,
+        'errors': errors,
+        'throughput_rps': round(total / elapsed, 2) if elapsed else 0.0,
+        **latency_summary(latencies),
+        'queries_per_request': round(queries / total, 2),
+    }
+
+
+def result_key(result):
+    return result['entrypoint'], result['scenario'], result['concurrency']
+
+
+def compare_with_baseline(results, baseline_path, threshold):
+    """Lista os cenários que pioraram mais que ``threshold`` (fração)"""
+    with open(baseline_path, encoding='utf-8') as handle:
+        baseline = {result_key(result): result for result in json.load(handle)['results']}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result_key(result))
+        if not previous:
+            continue
+        limits = {
+            'throughput_rps': previous['throughput_rps'] * (1 - threshold),
+            'p95_ms': previous['p95_ms'] * (1 + threshold),
+            'queries_per_request': previous['queries_per_request'],
+        }
+        checks = [
+            ('throughput_rps', limits['throughput_rps'], result['throughput_rps'] < limits['throughput_rps']),
+            ('p95_ms', limits['p95_ms'], result['p95_ms'] > limits['p95_ms']),
+            ('queries_per_request', limits['queries_per_request'], result['queries_per_request'] > limits['queries_per_request']),
+        ]
+        for metric, limit, regressed in checks:
+            if regressed:
+                regressions.append({
+                    'entrypoint': result['entrypoint'],
+                    'scenario': result['scenario'],
+                    'concurrency': result['concurrency'],
+                    'metric': metric,
+                    'baseline': previous[metric],
+                    'limit': round(limit, 3),
+                    'current': result[metric],
+                })
+    return regressions
+
+
+def print_row(result, header=False):
+    """Imprime o progresso no stderr (o stdout fica livre para o JSON)"""
+    if header:
+        title = f"{'entry':<5} {'cenário':<15} {'conc':>4} {'req':>6} {'err':>4} {'rps':>9} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'q/req':>6}"
+        print(title, file=sys.stderr)
+        print('-' * len(title), file=sys.stderr)
+    r = result
+    print(
+        f"{r['entrypoint']:<5} {r['scenario']:<15} {r['concurrency']:>4} {r['requests']:>6} {r['errors']:>4} "
+        f"{r['throughput_rps']:>9.1f} {r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {r['queries_per_request']:>6.2f}",
+        file=sys.stderr,
+    )
+
+
+def csv_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', help='Módulo de settings (padrão: DJANGO_SETTINGS_MODULE ou core.settings)')
+    parser.add_argument('--scenarios', type=csv_list, default=list(SCENARIOS), help='Cenários separados por vírgula')
+    parser.add_argument('--entrypoints', type=csv_list, default=list(ENTRYPOINTS), help='wsgi, asgi ou ambos')
+    parser.add_argument('--concurrency', type=lambda v: [int(c) for c in csv_list(v)], default=[1, 8], help='Níveis de concorrência, ex: 1,8,32')
+    parser.add_argument('--requests', type=int, default=200, help='Requisições medidas por cenário')
+    parser.add_argument('--warmup', type=int, default=10, help='Requisições de aquecimento (não medidas)')
+    parser.add_argument('--users', type=int, default=20, help='Usuários pré-criados para login/perfil')
+    parser.add_argument('--throttle', action='store_true', help='Mantém o throttling das rotas de autenticação ativo')
+    parser.add_argument('--output', default='-', help='Arquivo JSON de saída (padrão: stdout)')
+    parser.add_argument('--baseline', help='JSON de uma execução anterior para detectar regressões')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Piora tolerada em relação ao baseline (fração)')
+    args = parser.parse_args(argv)
+
+    unknown = set(args.scenarios) - set(SCENARIOS) | set(args.entrypoints) - set(ENTRYPOINTS)
+    if unknown:
+        parser.error(f'Valores desconhecidos: {", ".join(sorted(unknown))}')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    setup_django(args.settings)
+
+    from core.asgi import application as asgi_application
+    from core.wsgi import application as wsgi_application
+
+    from django.conf import settings
+
+    if settings.EMAIL_BACKEND == 'django.core.mail.backends.console.EmailBackend':
+        # O backend de console escreveria no stdout junto com o JSON
+        settings.EMAIL_BACKEND = 'django.core.mail.backends.dummy.EmailBackend'
+
+    if not args.throttle:
+        # Todas as requisições vêm do mesmo IP: sem isso a maioria seria 429
+        from rest_framework.settings import api_settings
+
+        settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}}
+        api_settings.reload()
+
+    applications = {'wsgi': wsgi_application, 'asgi': asgi_application}
+    destroy_database = create_benchmark_database()
+    fake_google = start_fake_google()
+    counter = QueryCounter()
+    counter.install()
+
+    try:
+        fixtures = Fixtures(args.users)
+        results = []
+        for entrypoint in args.entrypoints:
+            for scenario in args.scenarios:
+                for concurrency in args.concurrency:
+                    results.append(run_scenario(
+                        entrypoint, applications[entrypoint], scenario, fixtures,
+                        counter, args.requests, concurrency, args.warmup,
+                    ))
+                    print_row(results[-1], header=len(results) == 1)
+    finally:
+        fake_google.shutdown()
+        destroy_database()
+
+    payload = {
+        'environment': environment_info(),
+        'config': {
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'users': args.users,
+            'concurrency': args.concurrency,
+            'throttle': args.throttle,
+        },
+        'results': results,
+    }
+    if args.baseline:
+        payload['regressions'] = compare_with_baseline(results, args.baseline, args.threshold)
+
+    write_json(args.output, payload)
+
+    if payload.get('regressions'):
+        print(f"\n{len(payload['regressions'])} regressão(ões) em relação a {args.baseline}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Benchmark de sessões com a tabela django_session grande.
+
+Popula ``--rows`` sessões (metade expirada) em um banco descartável e mede o
+custo de leitura, escrita e criação de sessão nos modos ``db``, ``cached_db``
+e ``signed_cookies``. Depois compara a limpeza das sessões expiradas pelo
+``purge_sessions`` (lotes pequenos) com o ``clearsessions`` do Django (um
+único DELETE, que segura o lock da tabela até terminar).
+
+    python -m benchmarks.sessions --rows 1000000
+"""
+
+import argparse
+import io
+import random
+import sys
+import time
+from datetime import timedelta
+from importlib import import_module
+
+from benchmarks.common import (
+    create_benchmark_database,
+    environment_info,
+    latency_summary,
+    setup_django,
+    write_json,
+)
+
+INSERT_CHUNK = 50000
+
+
+def populate(rows, session_data):
+    """Insere ``rows`` sessões; as de índice par já estão expiradas"""
+    from django.contrib.sessions.models import Session
+    from django.db import connection, transaction
+    from django.utils import timezone
+
+    now = timezone.now()
+    past, future = now - timedelta(days=1), now + timedelta(days=14)
+    table = connection.ops.quote_name(Session._meta.db_table)
+    sql = f'INSERT INTO {table} (session_key, session_data, expire_date) VALUES (%s, %s, %s)'
+
+    valid_keys = []
+    for start in range(0, rows, INSERT_CHUNK):
+        chunk = []
+        for index in range(start, min(start + INSERT_CHUNK, rows)):
+            key = f'bench{index:034d}'
+            expired = index % 2 == 0
+            chunk.append((key, session_data, past if expired else future))
+            if not expired:
+                valid_keys.append(key)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, chunk)
+    return valid_keys
+
+
+def measure(func, samples):
+    latencies = []
+    for sample in samples:
+        start = time.perf_counter()
+        func(sample)
+        latencies.append(time.perf_counter() - start)
+    return latency_summary(latencies)
+
+
+def bench_mode(mode, engine, valid_keys, operations):
+    from django.test import override_settings
+
+    SessionStore = import_module(engine).SessionStore
+
+    with override_settings(SESSION_ENGINE=engine):
+        if mode == 'signed_cookies':
+            # A "chave" é o próprio cookie assinado
+            keys = []
+            for index in range(min(operations, 1000)):
+                store = SessionStore()
+                store['_auth_user_id'] = str(index)
+                store.save()
+                keys.append(store.session_key)
+        else:
+            keys = random.sample(valid_keys, min(operations, len(valid_keys), 1000))
+
+        def read(key):
+            SessionStore(session_key=key).load()
+
+        def write(key):
+            store = SessionStore(session_key=key)
+            store['counter'] = store.get('counter', 0) + 1
+            store.save()
+
+        def create(index):
+            store = SessionStore()
+            store['_auth_user_id'] = str(index)
+            store.save()
+
+        # Aquece o cache (cached_db) antes de medir
+        for key in keys:
+            read(key)
+
+        samples = [keys[index % len(keys)] for index in range(operations)]
+        return {
+            'mode': mode,
+            'read': measure(read, samples),
+            'write': measure(write, samples),
+            'create': measure(create, range(operations)),
+        }
+
+
+def bench_purge(rows, session_data, batch_size):
+    from django.contrib.sessions.models import Session
+    from django.core.management import call_command
+    from django.test import override_settings
+    from django.utils import timezone
+
+    results = {}
+    with override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db'):
+        expired = Session.objects.filter(expire_date__lt=timezone.now()).count()
+        start = time.perf_counter()
+        call_command('purge_sessions', batch_size=batch_size, sleep=0, stdout=io.StringIO())
+        elapsed = time.perf_counter() - start
+        batches = max(1, -(-expired // batch_size))
+        results['purge_sessions'] = {
+            'deleted': expired,
+            'batch_size': batch_size,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(expired / elapsed) if elapsed else 0,
+            'avg_batch_ms': round(elapsed / batches * 1000, 3),
+        }
+
+        # Repopula as expiradas e mede o DELETE único do clearsessions
+        Session.objects.all().delete()
+        populate(rows, session_data)
+        expired = Session.objects.filter(expire_date__lt=timezone.now()).count()
+        start = time.perf_counter()
+        call_command('clearsessions')
+        elapsed = time.perf_counter() - start
+        results['clearsessions'] = {
+            'deleted': expired,
+            'seconds': round(elapsed, 3),
+            'rows_per_second': round(expired / elapsed) if elapsed else 0,
+            'single_statement_lock_ms': round(elapsed * 1000, 3),
+        }
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', help='Módulo de settings')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Sessões na tabela (metade expirada)')
+    parser.add_argument('--operations', type=int, default=2000, help='Operações medidas por modo')
+    parser.add_argument('--batch-size', type=int, default=1000, help='Lote do purge_sessions')
+    parser.add_argument('--output', default='-')
+    args = parser.parse_args(argv)
+
+    setup_django(args.settings)
+
+    from django.conf import settings
+    from django.contrib.sessions.backends.db import SessionStore
+
+    destroy_database = create_benchmark_database()
+    try:
+        session_data = SessionStore().encode({'_auth_user_id': '1', '_auth_user_backend': 'x'})
+        start = time.perf_counter()
+        valid_keys = populate(args.rows, session_data)
+        populate_seconds = time.perf_counter() - start
+        print(f'{args.rows} sessões inseridas em {populate_seconds:.1f}s', file=sys.stderr)
+
+        modes = [
+            bench_mode(mode, engine, valid_keys, args.operations)
+            for mode, engine in settings.SESSION_ENGINES.items()
+        ]
+        purge = bench_purge(args.rows, session_data, args.batch_size)
+    finally:
+        destroy_database()
+
+    write_json(args.output, {
+        'environment': environment_info(),
+        'config': {'rows': args.rows, 'operations': args.operations},
+        'modes': modes,
+        'purge': purge,
+    })
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,149 @@
+"""
+Benchmark do throttling das rotas de autenticação.
+
+Mede o custo por requisição permitida do token bucket em memória compartilhada
+(``users.throttling``) comparado a nenhuma verificação e ao
+``AnonRateThrottle`` do DRF com cache em memória local, e confere que o limite
+é respeitado por vários processos usando o mesmo arquivo de buckets.
+
+    python -m benchmarks.throttle --iterations 100000 --processes 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import environment_info, setup_django, write_json
+
+
+def per_call_us(func, iterations):
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+def bench_overhead(iterations, bucket_file):
+    from django.test import override_settings
+    from rest_framework.parsers import JSONParser
+    from rest_framework.settings import api_settings
+    from rest_framework.test import APIRequestFactory
+    from rest_framework.request import Request
+    from rest_framework.throttling import AnonRateThrottle
+
+    from users.throttling import AUTH_THROTTLE_CLASSES, SharedTokenBucket
+
+    bucket = SharedTokenBucket(bucket_file, 65536)
+    factory = APIRequestFactory()
+
+    class View:
+        throttle_scope = 'login'
+
+    def make_request(index):
+        django_request = factory.post(
+            '/api/auth/login/',
+            {'email': f'user{index % 1000}@example.com', 'password': 'x'},
+            format='json',
+            REMOTE_ADDR=f'10.0.{index % 250}.{index % 200}',
+        )
+        return Request(django_request, parsers=[JSONParser()])
+
+    requests_ = [make_request(index) for index in range(1000)]
+    for request in requests_:
+        request.data  # parse antecipado: mede só o throttle
+
+    view = View()
+    counter = iter(range(10**12))
+    # Taxas altas: mede o caminho de requisições permitidas
+    rates = {'login': '1000000/s', 'login_identifier': '1000000/s', 'anon': '1000000/s'}
+
+    with override_settings(THROTTLE_BUCKET_FILE=bucket_file, REST_FRAMEWORK={'DEFAULT_THROTTLE_RATES': rates}):
+        AnonRateThrottle.THROTTLE_RATES = api_settings.DEFAULT_THROTTLE_RATES
+
+        def no_throttle():
+            requests_[next(counter) % 1000]
+
+        def bucket_only():
+            bucket.consume(f'login:{next(counter) % 1000}', 1_000_000, 1_000_000.0)
+
+        def shared_bucket_throttles():
+            request = requests_[next(counter) % 1000]
+            for throttle_class in AUTH_THROTTLE_CLASSES:
+                if not throttle_class().allow_request(request, view):
+                    raise AssertionError('requisição não deveria ser limitada')
+
+        def drf_cache_throttle():
+            request = requests_[next(counter) % 1000]
+            if not AnonRateThrottle().allow_request(request, view):
+                raise AssertionError('requisição não deveria ser limitada')
+
+        results = {
+            'baseline_us': per_call_us(no_throttle, iterations),
+            'bucket_consume_us': per_call_us(bucket_only, iterations),
+            'auth_throttles_us': per_call_us(shared_bucket_throttles, iterations),
+            'drf_anon_locmem_us': per_call_us(drf_cache_throttle, iterations),
+        }
+    return {name: round(value, 3) for name, value in results.items()}
+
+
+def _hammer(bucket_file, key, capacity, attempts, queue):
+    from users.throttling import SharedTokenBucket
+
+    bucket = SharedTokenBucket(bucket_file, 65536)
+    now = time.time()
+    # Refill desprezível: o total permitido deve ser exatamente a capacidade
+    allowed = sum(bucket.consume(key, capacity, 1e-9, now=now)[0] for _ in range(attempts))
+    queue.put(allowed)
+
+
+def bench_processes(processes, attempts, bucket_file):
+    capacity = attempts * processes // 2
+    queue = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=_hammer, args=(bucket_file, 'shared-key', capacity, attempts, queue))
+        for _ in range(processes)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    allowed = sum(queue.get() for _ in workers)
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    return {
+        'processes': processes,
+        'attempts': attempts * processes,
+        'capacity': capacity,
+        'allowed': allowed,
+        'limit_respected': allowed == capacity,
+        'ops_per_second': round(attempts * processes / elapsed),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', help='Módulo de settings')
+    parser.add_argument('--iterations', type=int, default=50000)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--output', default='-')
+    args = parser.parse_args(argv)
+
+    setup_django(args.settings)
+
+    with tempfile.TemporaryDirectory() as directory:
+        overhead = bench_overhead(args.iterations, os.path.join(directory, 'overhead.bin'))
+        processes = bench_processes(args.processes, args.iterations // args.processes, os.path.join(directory, 'shared.bin'))
+
+    write_json(args.output, {
+        'environment': environment_info(),
+        'overhead_per_request': overhead,
+        'multiprocess': processes,
+    })
+    return 0 if processes['limit_respected'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,6 +4,7 @@ Django settings for core project - API Version
 
 from pathlib import Path
 from decouple import config, Csv
+from django.core.exceptions import ImproperlyConfigured
 from datetime import timedelta
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS deve vir antes do CommonMiddleware
+    'users.compression.CompressionMiddleware',  # Antes de quem lê/altera o corpo da resposta
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -80,9 +82,45 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # Escritas concorrentes esperam pelo lock em vez de falhar na hora
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+        },
+        'TEST': {
+            # Banco de teste em arquivo: o SQLite em memória não suporta
+            # os testes de concorrência
+            'NAME': BASE_DIR / 'test_db.sqlite3',
+        },
+    }
+}
+
+# ============================================
+# CACHE E SESSÕES
+# ============================================
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
     }
 }
 
+# db: uma linha em django_session por leitura/escrita
+# cached_db: lê do cache e grava no banco; fora do DEBUG exige um cache
+#            compartilhado (Redis, Memcached), verificado em users.checks
+# signed_cookies: sessão no próprio cookie assinado, sem banco
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_MODE = config('SESSION_MODE', default='db')
+if SESSION_MODE not in SESSION_ENGINES:
+    raise ImproperlyConfigured(f"SESSION_MODE inválido: {SESSION_MODE!r} (use {', '.join(SESSION_ENGINES)})")
+SESSION_ENGINE = SESSION_ENGINES[SESSION_MODE]
+# Linhas apagadas por lote pelo comando purge_sessions
+SESSION_PURGE_BATCH_SIZE = config('SESSION_PURGE_BATCH_SIZE', default=1000, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -109,6 +147,16 @@ USE_TZ = True
 
 # Static files
 STATIC_URL = 'static/'
+STATIC_ROOT = config('STATIC_ROOT', default=str(BASE_DIR / 'staticfiles'))
+
+# collectstatic grava irmãos .br/.gz dos estáticos (users.compression)
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'users.compression.CompressedStaticFilesStorage'},
+}
+
+# Respostas menores que isso (bytes) não são comprimidas
+COMPRESSION_MIN_SIZE = config('COMPRESSION_MIN_SIZE', default=1024, cast=int)
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -137,15 +185,35 @@ CORS_ALLOW_CREDENTIALS = True
 # ============================================
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Taxas dos throttles de autenticação (users.throttling), por escopo
+    'DEFAULT_THROTTLE_RATES': {
+        'login': '20/min',
+        'login_identifier': '5/min',
+        'register': '10/min',
+        'register_identifier': '3/min',
+        'google_auth': '20/min',
+    },
+    # Proxies reversos na frente da aplicação. Com 0 o IP dos throttles é o
+    # REMOTE_ADDR; o X-Forwarded-For (enviado pelo cliente) só é lido com
+    # NUM_PROXIES > 0, pegando o endereço adicionado pelo proxy mais externo.
+    'NUM_PROXIES': config('NUM_PROXIES', default=0, cast=int),
 }
 
+# Token buckets compartilhados entre os workers do host (arquivo mmap, fora
+# do /tmp para não ter um nome previsível em pasta compartilhada)
+THROTTLE_BUCKET_FILE = config('THROTTLE_BUCKET_FILE', default=str(BASE_DIR / 'throttle-buckets.bin'))
+THROTTLE_BUCKET_SLOTS = config('THROTTLE_BUCKET_SLOTS', default=65536, cast=int)
+
+# Os testes usam um arquivo de buckets temporário (não o do servidor local)
+TEST_RUNNER = 'users.test_runner.TestRunner'
+
 # ============================================
 # DRF SPECTACULAR (SWAGGER/OpenAPI)
 # ============================================
@@ -183,6 +251,10 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Tokens de acesso já verificados mantidos em memória por processo
+# (users.authentication.CachedJWTAuthentication)
+JWT_VERIFIED_TOKEN_CACHE_SIZE = config('JWT_VERIFIED_TOKEN_CACHE_SIZE', default=4096, cast=int)
+
 # ============================================
 # DJ-REST-AUTH CONFIGURATION
 # ============================================
@@ -206,11 +278,25 @@ SOCIALACCOUNT_AUTO_SIGNUP = True
 SOCIALACCOUNT_EMAIL_VERIFICATION = 'none'
 SOCIALACCOUNT_EMAIL_REQUIRED = True
 SOCIALACCOUNT_QUERY_EMAIL = True
+# Cacheia a configuração de SocialApp por processo (users.adapters). Mudanças
+# valem na hora em todos os workers com um CACHE_BACKEND compartilhado; com o
+# locmem, em até SOCIAL_APP_CACHE_TTL segundos.
+SOCIALACCOUNT_ADAPTER = 'users.adapters.SocialAccountAdapter'
+SOCIAL_APP_CACHE_TTL = config('SOCIAL_APP_CACHE_TTL', default=60, cast=int)
 
 # ============================================
 # EMAIL CONFIGURATION
 # ============================================
-EMAIL_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+# Backend que efetivamente entrega os emails (SMTP, console...)
+EMAIL_DELIVERY_BACKEND = config('EMAIL_BACKEND', default='django.core.mail.backends.console.EmailBackend')
+# Com o outbox ativo as requisições só gravam o email no banco; o comando
+# send_outbox faz a entrega em lotes usando EMAIL_DELIVERY_BACKEND
+EMAIL_OUTBOX = config('EMAIL_OUTBOX', default=True, cast=bool)
+EMAIL_BACKEND = 'users.mail.OutboxEmailBackend' if EMAIL_OUTBOX else EMAIL_DELIVERY_BACKEND
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_DELAY = config('EMAIL_OUTBOX_RETRY_DELAY', default=60, cast=int)  # segundos, dobra a cada tentativa
+EMAIL_TIMEOUT = config('EMAIL_TIMEOUT', default=10, cast=int)
 EMAIL_HOST = config('EMAIL_HOST', default='localhost')
 EMAIL_PORT = config('EMAIL_PORT', default=25, cast=int)
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=False, cast=bool)
@@ -235,4 +321,8 @@ SOCIALACCOUNT_PROVIDERS = {
             'key': config('GOOGLE_KEY', default='')
         }
     }
-}
\ No newline at end of file
+}
+
+# Endpoints OAuth do Google (sobrescrevíveis para testes e benchmarks locais)
+GOOGLE_TOKEN_URL = config('GOOGLE_TOKEN_URL', default='https://oauth2.googleapis.com/token')
+GOOGLE_USERINFO_URL = config('GOOGLE_USERINFO_URL', default='https://www.googleapis.com/oauth2/v2/userinfo')
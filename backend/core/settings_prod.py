@@ -14,4 +14,18 @@ X_FRAME_OPTIONS = 'DENY'
 # HSTS
 SECURE_HSTS_SECONDS = 31536000
 SECURE_HSTS_INCLUDE_SUBDOMAINS = True
-SECURE_HSTS_PRELOAD = True
\ No newline at end of file
+SECURE_HSTS_PRELOAD = True
+
+# ============================================
+# PERFIL DE PRODUÇÃO (boot rápido dos workers)
+# ============================================
+# Apps só de desenvolvimento não são carregados. A documentação da API
+# (drf_spectacular) só entra com API_DOCS_ENABLED=True.
+API_DOCS_ENABLED = config('API_DOCS_ENABLED', default=False, cast=bool)
+
+DEV_ONLY_APPS = {'django_extensions'}
+if not API_DOCS_ENABLED:
+    DEV_ONLY_APPS.add('drf_spectacular')
+    REST_FRAMEWORK = {**REST_FRAMEWORK, 'DEFAULT_SCHEMA_CLASS': 'rest_framework.schemas.openapi.AutoSchema'}
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in DEV_ONLY_APPS]
@@ -1,23 +1,49 @@
+from django.apps import apps
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-    SpectacularRedocView
-)
+from dj_rest_auth import urls as rest_auth_urls
+from dj_rest_auth.registration import urls as registration_urls
+from dj_rest_auth.views import LoginView
+from dj_rest_auth.registration.views import RegisterView
+from users.throttling import AUTH_THROTTLE_CLASSES
+
+
+def without(urls, *names):
+    """Padrões do URLconf sem as rotas redefinidas aqui (mesmo nome, sem duplicar o reverse)"""
+    return [pattern for pattern in urls.urlpatterns if getattr(pattern, 'name', None) not in names]
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     
-    # Endpoints de autenticação
-    path('api/auth/', include('dj_rest_auth.urls')),
-    path('api/auth/registration/', include('dj_rest_auth.registration.urls')),
+    # Endpoints de autenticação (login e registro com throttling; saem dos includes)
+    path(
+        'api/auth/login/',
+        LoginView.as_view(throttle_scope='login', throttle_classes=AUTH_THROTTLE_CLASSES),
+        name='rest_login',
+    ),
+    path(
+        'api/auth/registration/',
+        RegisterView.as_view(throttle_scope='register', throttle_classes=AUTH_THROTTLE_CLASSES),
+        name='rest_register',
+    ),
+    path('api/auth/', include(without(rest_auth_urls, 'rest_login'))),
+    path('api/auth/registration/', include(without(registration_urls, 'rest_register'))),
     
     # Endpoints dos usuários
     path('api/', include('users.urls')),
-    
-    # Documentação da API
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
-]
\ No newline at end of file
+]
+
+# Documentação da API (fora do perfil de produção, a menos que API_DOCS_ENABLED)
+if apps.is_installed('drf_spectacular'):
+    from drf_spectacular.views import (
+        SpectacularAPIView,
+        SpectacularSwaggerView,
+        SpectacularRedocView
+    )
+
+    urlpatterns += [
+        path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
+        path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
+        path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
+    ]
\ No newline at end of file
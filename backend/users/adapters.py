@@ -0,0 +1,82 @@
+"""
+Adapter do allauth com cache por processo da configuração dos provedores.
+
+O allauth consulta ``SocialApp`` (e seus ``sites``) no banco a cada login
+social. Aqui a lista de apps é resolvida uma vez por processo e por
+(site, provedor, client_id), com um app por provedor: o de
+``SOCIALACCOUNT_PROVIDERS['APP']`` (``.env``) tem prioridade e o do banco é o
+fallback, então trocar as credenciais no ``.env`` vale no restart.
+
+Invalidação: os receivers em ``users.signals`` limpam o cache do processo e
+trocam uma versão no cache do Django (``CACHES['default']``); os outros
+workers comparam essa versão a cada uso. Com um cache compartilhado (Redis,
+Memcached) a troca vale na hora para todos; com o locmem (padrão) cada worker
+só recarrega depois de ``SOCIAL_APP_CACHE_TTL`` segundos.
+"""
+
+import time
+import uuid
+
+from allauth.socialaccount.adapter import DefaultSocialAccountAdapter, get_adapter
+from django.conf import settings
+from django.contrib.sites.shortcuts import get_current_site
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_CACHE_KEY = 'users:social-apps-version'
+
+_apps_cache = {}
+
+
+def clear_provider_cache():
+    """
+    Descarta a configuração de provedores em cache neste processo e, após o
+    commit, nos demais (nova versão no cache compartilhado).
+    """
+    _apps_cache.clear()
+    transaction.on_commit(lambda: cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None))
+
+
+def get_provider_app(provider, request=None):
+    """
+    Retorna o SocialApp do provedor (client_id, secret, key) sem tocar o
+    banco depois da primeira chamada.
+
+    Levanta ``SocialApp.DoesNotExist`` se o provedor não estiver configurado.
+    """
+    return get_adapter(request).get_app(request, provider)
+
+
+class SocialAccountAdapter(DefaultSocialAccountAdapter):
+
+    def list_apps(self, request, provider=None, client_id=None):
+        site_id = get_current_site(request).pk
+        key = (site_id, provider, client_id)
+        version = cache.get(VERSION_CACHE_KEY)
+        now = time.monotonic()
+
+        entry = _apps_cache.get(key)
+        if entry is None or entry[1] != version or now - entry[2] >= settings.SOCIAL_APP_CACHE_TTL:
+            apps = super().list_apps(request, provider=provider, client_id=client_id)
+            if request is None:
+                # Sem request o allauth não filtra pelo site: aplica o SITE_ID
+                from allauth.socialaccount.models import SocialApp
+
+                on_site = set(SocialApp.objects.filter(sites=site_id).values_list('pk', flat=True))
+                apps = [app for app in apps if app.pk is None or app.pk in on_site]
+            entry = _apps_cache[key] = (_one_app_per_provider(apps), version, now)
+        return list(entry[0])
+
+
+def _one_app_per_provider(apps):
+    """
+    Mantém um app por provedor, para o ``get_app`` do allauth nunca ver dois
+    (``MultipleObjectsReturned``): primeiro o de ``SOCIALACCOUNT_PROVIDERS['APP']``,
+    depois os do banco (o mais antigo). Apps sem client_id são ignorados.
+    """
+    unique = {}
+    for app in sorted(apps, key=lambda app: (app.pk is not None, app.pk or 0)):
+        if not app.client_id:
+            continue
+        unique.setdefault(app.provider_id or app.provider, app)
+    return tuple(unique.values())
@@ -3,7 +3,7 @@ from django.contrib.auth.admin import UserAdmin
 from django.utils.html import format_html
 from django.urls import reverse
 from allauth.socialaccount.models import SocialAccount
-from .models import CustomUser
+from .models import CustomUser, OutboxEmail
 
 
 @admin.register(CustomUser)
@@ -48,4 +48,19 @@ class CustomUserAdmin(UserAdmin):
             return format_html('<span style="color: green;">✅ Verificado</span>')
         return format_html('<span style="color: red;">❌ Não verificado</span>')
     
-    email_verified.short_description = 'Email'
\ No newline at end of file
+    email_verified.short_description = 'Email'
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    search_fields = ('subject', 'to')
+    readonly_fields = ('created_at', 'sent_at', 'last_error')
+    ordering = ('-created_at',)
+
+    def recipients(self, obj):
+        """Destinatários principais"""
+        return ', '.join(obj.to)
+
+    recipients.short_description = 'Para'
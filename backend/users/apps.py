@@ -1,4 +1,4 @@
-from django.apps import AppConfig
+from django.apps import AppConfig, apps
 
 
 class UsersConfig(AppConfig):
@@ -6,5 +6,9 @@ class UsersConfig(AppConfig):
     name = 'users'
 
     def ready(self):
-        """Importa os signals quando o app estiver pronto"""
-        import users.signals
\ No newline at end of file
+        """Importa os signals, os checks (e as extensões do schema) quando o app estiver pronto"""
+        import users.checks
+        import users.signals
+
+        if apps.is_installed('drf_spectacular'):
+            import users.schema
\ No newline at end of file
@@ -0,0 +1,107 @@
+"""
+Autenticação JWT com cache dos tokens de acesso já verificados.
+
+O mesmo access token chega centenas de vezes por minuto do mesmo cliente
+React; decodificar base64, verificar o HMAC e validar as claims a cada
+requisição é trabalho repetido. Aqui o token verificado fica num LRU limitado,
+com chave no SHA-256 do token bruto, e:
+
+- nunca é servido depois do ``exp`` do token;
+- a blacklist do simplejwt (tokens com ``check_blacklist``) é consultada
+  também nos acertos do cache;
+- o usuário continua sendo carregado a cada requisição, então ``is_active``
+  e ``CHECK_REVOKE_TOKEN`` (troca de senha) valem normalmente.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+
+class VerifiedTokenCache:
+    """LRU de tokens verificados, limitado em tamanho e pelo ``exp``"""
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, now=None):
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            token, expires_at = entry
+            if now >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return token
+
+    def set(self, key, token, expires_at):
+        with self._lock:
+            self._entries[key] = (token, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+token_cache = VerifiedTokenCache(settings.JWT_VERIFIED_TOKEN_CACHE_SIZE)
+
+
+def token_cache_key(raw_token):
+    if isinstance(raw_token, str):
+        raw_token = raw_token.encode()
+    return hashlib.sha256(raw_token).digest()
+
+
+def forget_token(raw_token):
+    """Remove um token do cache (ex: ao revogá-lo por fora do simplejwt)"""
+    token_cache.discard(token_cache_key(raw_token))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication que reaproveita tokens já verificados"""
+
+    def get_validated_token(self, raw_token):
+        key = token_cache_key(raw_token)
+        token = token_cache.get(key)
+        if token is not None:
+            self.check_revoked(token)
+            return token
+
+        token = super().get_validated_token(raw_token)
+        expires_at = token.payload.get('exp')
+        if expires_at is not None:
+            token_cache.set(key, token, expires_at)
+        return token
+
+    def check_revoked(self, token):
+        """Repete a checagem de blacklist que o simplejwt faz no verify()"""
+        if not hasattr(token, 'check_blacklist'):
+            return
+        if not apps.is_installed('rest_framework_simplejwt.token_blacklist'):
+            return
+        try:
+            token.check_blacklist()
+        except TokenError as e:
+            raise InvalidToken(_('Token is blacklisted')) from e
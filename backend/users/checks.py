@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, register
+
+SESSION_CACHE_ENGINES = {
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+}
+
+# Caches que não são compartilhados entre os processos
+LOCAL_CACHE_BACKENDS = {
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+}
+
+
+@register(Tags.caches)
+def check_session_cache(app_configs, **kwargs):
+    """
+    Sessões em cache precisam de um cache compartilhado: com o locmem o logout
+    só limpa a sessão do worker que o recebeu.
+    """
+    if settings.DEBUG or settings.SESSION_ENGINE not in SESSION_CACHE_ENGINES:
+        return []
+    backend = settings.CACHES[getattr(settings, 'SESSION_CACHE_ALIAS', 'default')]['BACKEND']
+    if backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        Error(
+            f'SESSION_MODE=cached_db com o cache local {backend}',
+            hint='Configure um CACHE_BACKEND compartilhado (Redis, Memcached) ou use SESSION_MODE=db.',
+            id='users.E001',
+        )
+    ]
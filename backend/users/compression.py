@@ -0,0 +1,238 @@
+"""
+Compressão das respostas e dos arquivos estáticos.
+
+- ``CompressionMiddleware``: negocia brotli (se o pacote ``brotli`` estiver
+  instalado) ou gzip pelo ``Accept-Encoding`` e comprime respostas de tipos
+  textuais acima de ``COMPRESSION_MIN_SIZE``, inclusive respostas streaming
+  (síncronas e assíncronas). Um ``FileResponse`` com irmão pré-comprimido
+  (``arquivo.br``/``arquivo.gz``) é servido direto do irmão.
+- ``CompressedStaticFilesStorage``: no ``collectstatic`` grava os irmãos
+  ``.br``/``.gz`` uma vez, para o servidor de estáticos (nginx com
+  ``gzip_static``/``brotli_static``, ou o próprio middleware) não gastar CPU
+  por requisição.
+"""
+
+import os
+import re
+import zlib
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import StaticFilesStorage
+from django.core.files.base import ContentFile
+from django.http import FileResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_string
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional; sem ele só há gzip
+    brotli = None
+
+# Níveis para respostas dinâmicas (latência) e para estáticos (feitos uma vez)
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+STATIC_GZIP_LEVEL = 9
+STATIC_BROTLI_QUALITY = 11
+
+COMPRESSIBLE_TYPES = re.compile(r'^text/|[/+.](json|javascript|xml|yaml|openapi)\b|^image/svg\+xml')
+STATIC_EXTENSIONS = ('.css', '.js', '.mjs', '.map', '.svg', '.html', '.txt', '.json', '.xml', '.ttf', '.otf', '.eot')
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+_accept_encoding_re = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def available_encodings():
+    """Codificações suportadas, em ordem de preferência"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding(accept_encoding):
+    """Escolhe br ou gzip pelo Accept-Encoding (respeita ``q=0``)"""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        match = _accept_encoding_re.match(item)
+        if not match:
+            continue
+        try:
+            quality = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+        accepted[match.group(1).lower()] = quality
+
+    wildcard = accepted.get('*', 0)
+    best, best_quality = None, 0
+    for encoding in available_encodings():
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(data, encoding, static=False):
+    if encoding == 'br':
+        return brotli.compress(data, quality=STATIC_BROTLI_QUALITY if static else BROTLI_QUALITY)
+    if static:
+        return _gzip(data, STATIC_GZIP_LEVEL)
+    # Bytes aleatórios no cabeçalho gzip, como o GZipMiddleware (mitiga BREACH)
+    return compress_string(data, max_random_bytes=100)
+
+
+def _gzip(data, level):
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    return compressor.compress(data) + compressor.flush()
+
+
+class _StreamCompressor:
+    """Comprime pedaço a pedaço, liberando cada pedaço logo (SSE, downloads)"""
+
+    def __init__(self, encoding):
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+            self._compress = self._compressor.process
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+            self._compress = self._compressor.compress
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+
+    def chunk(self, data):
+        return self._compress(data) + self._flush()
+
+    def finish(self):
+        return self._finish()
+
+
+def compress_stream(chunks, encoding):
+    compressor = _StreamCompressor(encoding)
+    for data in chunks:
+        if data:
+            yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+async def acompress_stream(chunks, encoding):
+    compressor = _StreamCompressor(encoding)
+    async for data in chunks:
+        if data:
+            yield compressor.chunk(data)
+    yield compressor.finish()
+
+
+def precompressed_path(path, encoding):
+    """Caminho do irmão pré-comprimido, se existir e não estiver desatualizado"""
+    sibling = path + SUFFIXES[encoding]
+    try:
+        if os.path.getmtime(sibling) >= os.path.getmtime(path):
+            return sibling
+    except OSError:
+        pass
+    return None
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Comprime as respostas com brotli ou gzip.
+
+    Deve ficar antes dos middlewares que leem ou alteram o corpo da resposta.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = settings.COMPRESSION_MIN_SIZE
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or response.status_code in (204, 206, 304):
+            return response
+        if not COMPRESSIBLE_TYPES.search(response.get('Content-Type', '')):
+            return response
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if isinstance(response, FileResponse) and self.serve_precompressed(response, encoding):
+            pass
+        elif response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            # Tamanho final só é conhecido ao terminar o stream
+            if response.has_header('Content-Length'):
+                del response.headers['Content-Length']
+        else:
+            compressed = compress(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        # ETag forte vira fraco (RFC 9110 8.8.1), como no GZipMiddleware
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+    def serve_precompressed(self, response, encoding):
+        """Troca o arquivo do FileResponse pelo irmão .br/.gz gerado no collectstatic"""
+        path = getattr(response.file_to_stream, 'name', None)
+        if not isinstance(path, str):
+            return False
+        sibling = precompressed_path(path, encoding)
+        if sibling is None:
+            return False
+        # O FileResponse refaz os cabeçalhos pelo nome do irmão (application/gzip,
+        # filename="a.css.gz"): mantém os do arquivo original
+        original = {header: response.headers.get(header) for header in ('Content-Type', 'Content-Disposition')}
+        response.file_to_stream.close()
+        response.streaming_content = open(sibling, 'rb')
+        for header, value in original.items():
+            if value is None:
+                response.headers.pop(header, None)
+            else:
+                response.headers[header] = value
+        return True
+
+
+class CompressedStaticFilesStorage(StaticFilesStorage):
+    """
+    Storage de estáticos que grava ``.br`` (se houver brotli) e ``.gz`` ao lado
+    de cada arquivo textual no ``collectstatic``. Irmãos atualizados são
+    mantidos; irmãos que não economizam bytes não são gravados.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        parent = getattr(super(), 'post_process', None)
+        if parent is not None:
+            yield from parent(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        min_size = settings.COMPRESSION_MIN_SIZE
+        for name in paths:
+            if not name.endswith(STATIC_EXTENSIONS):
+                continue
+            path = self.path(name)
+            if os.path.getsize(path) < min_size:
+                continue
+            data = None
+            for encoding in available_encodings():
+                sibling_name = name + SUFFIXES[encoding]
+                if precompressed_path(path, encoding):
+                    continue
+                if data is None:
+                    with self.open(name) as original:
+                        data = original.read()
+                compressed = compress(data, encoding, static=True)
+                if self.exists(sibling_name):
+                    self.delete(sibling_name)
+                if len(compressed) < len(data):
+                    self._save(sibling_name, ContentFile(compressed))
+                    yield name, sibling_name, True
@@ -0,0 +1,171 @@
+"""
+Outbox de emails.
+
+O ``OutboxEmailBackend`` só grava as mensagens na tabela ``OutboxEmail``
+(dentro da transação da requisição), então o signup não espera pelo servidor
+SMTP. O comando ``send_outbox`` entrega a fila em lotes reutilizando uma única
+conexão com o backend real (``EMAIL_DELIVERY_BACKEND``), com retry e backoff
+exponencial.
+"""
+
+import base64
+from contextlib import suppress
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db import transaction
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+# Tempo em que um lote fica reservado para o worker que o pegou
+CLAIM_LEASE = timedelta(minutes=5)
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    """Backend de email que apenas enfileira as mensagens no banco"""
+
+    def send_messages(self, email_messages):
+        rows = [message_to_outbox(message) for message in email_messages if message.recipients()]
+        OutboxEmail.objects.bulk_create(rows)
+        return len(rows)
+
+
+def message_to_outbox(message):
+    """Converte um EmailMessage em OutboxEmail (não salvo)"""
+    attachments = []
+    for attachment in message.attachments:
+        if not isinstance(attachment, tuple):
+            raise ValueError('O outbox só suporta anexos (nome, conteúdo, mimetype)')
+        filename, content, mimetype = attachment
+        if isinstance(content, str):
+            content = content.encode()
+        attachments.append([filename, base64.b64encode(content).decode('ascii'), mimetype])
+
+    return OutboxEmail(
+        subject=message.subject,
+        body=message.body,
+        from_email=message.from_email or settings.DEFAULT_FROM_EMAIL,
+        to=list(message.to),
+        cc=list(message.cc),
+        bcc=list(message.bcc),
+        reply_to=list(message.reply_to),
+        headers=dict(message.extra_headers),
+        alternatives=[list(alternative) for alternative in getattr(message, 'alternatives', [])],
+        attachments=attachments,
+    )
+
+
+def outbox_to_message(email, connection=None):
+    """Reconstrói o EmailMessage a partir de um OutboxEmail"""
+    message = EmailMultiAlternatives(
+        subject=email.subject,
+        body=email.body,
+        from_email=email.from_email,
+        to=email.to,
+        cc=email.cc,
+        bcc=email.bcc,
+        reply_to=email.reply_to,
+        headers=email.headers,
+        connection=connection,
+    )
+    for content, mimetype in email.alternatives:
+        message.attach_alternative(content, mimetype)
+    for filename, content, mimetype in email.attachments:
+        message.attach(filename, base64.b64decode(content), mimetype)
+    return message
+
+
+def claim_batch(batch_size):
+    """
+    Reserva até ``batch_size`` emails vencidos, adiando ``next_attempt_at``
+    pelo lease para que outro worker não pegue os mesmos enquanto são enviados.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(status=OutboxEmail.Status.PENDING, next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboxEmail.objects.filter(id__in=ids).update(next_attempt_at=now + CLAIM_LEASE)
+    return list(OutboxEmail.objects.filter(id__in=ids).order_by('id'))
+
+
+def retry_delay(attempts):
+    """Backoff exponencial: RETRY_DELAY, 2x, 4x... limitado a 1 dia"""
+    seconds = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, 86400))
+
+
+def record_failure(email, exc):
+    """Registra a falha e agenda a próxima tentativa (ou desiste)"""
+    email.attempts += 1
+    email.last_error = f'{type(exc).__name__}: {exc}'
+    if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+        email.status = OutboxEmail.Status.FAILED
+    else:
+        email.next_attempt_at = timezone.now() + retry_delay(email.attempts)
+    email.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at'])
+
+
+def deliver_batch(emails, connection):
+    """
+    Envia os emails pela ``connection``, reabrindo-a se cair no meio do lote.
+
+    Retorna (enviados, falhas, servidor_disponível).
+    """
+    sent = failed = 0
+    for index, email in enumerate(emails):
+        try:
+            # No-op se a conexão já está aberta
+            connection.open()
+        except Exception as exc:
+            # Servidor fora do ar: reagenda o resto do lote sem insistir
+            for pending in emails[index:]:
+                record_failure(pending, exc)
+            return sent, failed + len(emails) - index, False
+
+        try:
+            connection.send_messages([outbox_to_message(email, connection)])
+        except Exception as exc:
+            # A conexão pode ter ficado inconsistente: reabre no próximo
+            with suppress(Exception):
+                connection.close()
+            record_failure(email, exc)
+            failed += 1
+        else:
+            email.attempts += 1
+            email.status = OutboxEmail.Status.SENT
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            email.save(update_fields=['attempts', 'last_error', 'status', 'sent_at'])
+            sent += 1
+    return sent, failed, True
+
+
+def drain_outbox(batch_size=None):
+    """
+    Entrega todos os emails vencidos em lotes, com uma única conexão.
+
+    Retorna (enviados, falhas).
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    connection = get_connection(settings.EMAIL_DELIVERY_BACKEND, fail_silently=False)
+    total_sent = total_failed = 0
+    try:
+        while True:
+            emails = claim_batch(batch_size)
+            if not emails:
+                break
+            sent, failed, available = deliver_batch(emails, connection)
+            total_sent += sent
+            total_failed += failed
+            if not available:
+                break
+    finally:
+        connection.close()
+    return total_sent, total_failed
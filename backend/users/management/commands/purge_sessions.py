@@ -0,0 +1,47 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.backends.db import SessionStore as DBStore
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        'Apaga as sessões expiradas em lotes pequenos pelo índice de '
+        'expire_date, sem segurar locks longos na tabela'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Sessões por lote (padrão: SESSION_PURGE_BATCH_SIZE)')
+        parser.add_argument('--sleep', type=float, default=0.05, help='Pausa em segundos entre lotes')
+
+    def handle(self, *args, **options):
+        engine = import_module(settings.SESSION_ENGINE)
+        if not issubclass(engine.SessionStore, DBStore):
+            # Sessões em cookie expiram no cliente; outros engines sabem se limpar
+            try:
+                engine.SessionStore.clear_expired()
+            except NotImplementedError:
+                pass
+            self.stdout.write(f'Nada a apagar em lotes para {settings.SESSION_ENGINE}')
+            return
+
+        batch_size = options['batch_size'] or settings.SESSION_PURGE_BATCH_SIZE
+        model = engine.SessionStore.get_model_class()
+        expired = model.objects.filter(expire_date__lt=timezone.now()).order_by('expire_date')
+
+        total = 0
+        while True:
+            keys = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not keys:
+                break
+            # Cada lote é uma transação curta (autocommit)
+            deleted, _ = model.objects.filter(pk__in=keys).delete()
+            total += deleted
+            if len(keys) < batch_size:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(f'{total} sessão(ões) expirada(s) apagada(s)')
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.mail import drain_outbox
+
+
+class Command(BaseCommand):
+    help = 'Entrega os emails pendentes do outbox em lotes, com retry e backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, help='Emails por lote (padrão: EMAIL_OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--loop', action='store_true', help='Continua rodando e verificando a fila')
+        parser.add_argument('--interval', type=float, default=5.0, help='Segundos entre verificações com --loop')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = drain_outbox(options['batch_size'])
+            if sent or failed or not options['loop']:
+                self.stdout.write(f'{sent} email(s) enviado(s), {failed} falha(s)')
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
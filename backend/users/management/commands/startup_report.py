@@ -0,0 +1,100 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def parse_importtime(stderr):
+    """Lê a saída do ``-X importtime``: [(módulo, self_us, cumulative_us)]"""
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(parts[0]), int(parts[1])
+        except ValueError:
+            continue  # cabeçalho
+        modules.append((parts[2].strip(), self_us, cumulative_us))
+    return modules
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede o boot de um worker (imports, AppConfig.ready, middlewares) '
+        'e o RSS máximo, em processos novos'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Boots medidos (reporta o mediano)')
+        parser.add_argument('--top', type=int, default=15, help='Pacotes listados no custo de import')
+        parser.add_argument('--urls', action='store_true', help='Inclui URLconf e views (custo da 1ª requisição)')
+        parser.add_argument('--json', action='store_true', help='Saída em JSON')
+
+    def handle(self, *args, **options):
+        runs = sorted(
+            (self.boot(options['urls'])[0] for _ in range(max(1, options['runs']))),
+            key=lambda run: run['stages']['total_ms'],
+        )
+        report = runs[len(runs) // 2]
+        report['runs'] = len(runs)
+
+        # Boot separado: o -X importtime deixa os imports mais lentos
+        _, stderr = self.boot(options['urls'], importtime=True)
+        report['imports'] = self.import_breakdown(parse_importtime(stderr), options['top'])
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.write_report(report)
+
+    def boot(self, urls, importtime=False):
+        command = [sys.executable]
+        if importtime:
+            command += ['-X', 'importtime']
+        command += ['-m', 'users.startup']
+        if urls:
+            command.append('--urls')
+
+        result = subprocess.run(command, cwd=settings.BASE_DIR, env=os.environ.copy(), capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(f'Falha no boot do worker:\n{result.stderr[-2000:]}')
+        return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr
+
+    def import_breakdown(self, modules, top):
+        by_package = defaultdict(int)
+        for name, self_us, _ in modules:
+            by_package[name.split('.')[0]] += self_us
+        packages = sorted(by_package.items(), key=lambda item: item[1], reverse=True)
+        return {
+            'modules': len(modules),
+            'total_ms': round(sum(by_package.values()) / 1000, 3),
+            'packages': [{'package': name, 'self_ms': round(us / 1000, 3)} for name, us in packages[:top]],
+        }
+
+    def write_report(self, report):
+        write = self.stdout.write
+        write(f"Boot do worker ({report['settings']}), mediana de {report['runs']} execução(ões)")
+        for stage, ms in report['stages'].items():
+            write(f'  {stage.removesuffix("_ms"):<16} {ms:>10.1f} ms')
+        if report['max_rss_kb'] is not None:
+            write(f"  {'rss máximo':<16} {report['max_rss_kb'] / 1024:>10.1f} MB")
+        write(f"  {'módulos':<16} {report['modules_loaded']:>10}")
+
+        write('\nApps (import + models + ready):')
+        for app in sorted(report['apps'], key=lambda app: app['total_ms'], reverse=True):
+            write(
+                f"  {app['app']:<42} {app['total_ms']:>8.1f} ms  "
+                f"(import {app['import_ms']:.1f}, models {app['models_ms']:.1f}, ready {app['ready_ms']:.1f})"
+            )
+
+        imports = report['imports']
+        write(f"\nImports por pacote (-X importtime, {imports['modules']} módulos, {imports['total_ms']:.1f} ms):")
+        for package in imports['packages']:
+            write(f"  {package['package']:<42} {package['self_ms']:>8.1f} ms")
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:36
+
+import django.db.models.functions.text
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def merge_case_duplicate_emails(apps, schema_editor):
+    """
+    Antes da constraint, resolve emails repetidos só na caixa (o login com
+    Google comparava o email diferenciando maiúsculas). O usuário mais antigo
+    fica com o email e recebe as contas sociais e os EmailAddress dos outros;
+    os demais ficam sem email (o login por username continua funcionando).
+    """
+    User = apps.get_model('users', 'CustomUser')
+    SocialAccount = apps.get_model('socialaccount', 'SocialAccount')
+    EmailAddress = apps.get_model('account', 'EmailAddress')
+
+    users = User.objects.exclude(email='').annotate(email_ci=Lower('email'))
+    duplicated = (
+        users.values('email_ci').annotate(total=Count('pk')).filter(total__gt=1).values_list('email_ci', flat=True)
+    )
+    for email_ci in duplicated:
+        keeper, *others = users.filter(email_ci=email_ci).order_by('pk')
+        for other in others:
+            SocialAccount.objects.filter(user=other).update(user=keeper)
+            for address in EmailAddress.objects.filter(user=other):
+                if EmailAddress.objects.filter(user=keeper, email__iexact=address.email).exists():
+                    address.delete()
+                else:
+                    address.user = keeper
+                    address.primary = False
+                    address.save(update_fields=['user', 'primary'])
+            print(
+                f'\n  Email duplicado {other.email!r}: usuário {other.username!r} (id {other.pk}) '
+                f'mesclado em {keeper.username!r} (id {keeper.pk}) e ficou sem email'
+            )
+            other.email = ''
+            other.save(update_fields=['email'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('users', '0001_initial'),
+        ('account', '0001_initial'),
+        ('socialaccount', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_case_duplicate_emails, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='customuser',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), condition=models.Q(('email', ''), _negated=True), name='users_customuser_email_ci_unique'),
+        ),
+    ]
@@ -1,8 +1,62 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 class CustomUser(AbstractUser):
         # Herda de AbstractUser (já tem username, email, password, etc)
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            # Email único (sem diferenciar maiúsculas) garantido pelo banco,
+            # permite resolver logins concorrentes via IntegrityError
+            models.UniqueConstraint(
+                Lower('email'),
+                name='users_customuser_email_ci_unique',
+                condition=~models.Q(email=''),
+            ),
+        ]
     
     def __str__(self):
-        return self.username
\ No newline at end of file
+        return self.username
+
+
+class OutboxEmail(models.Model):
+    """
+    Email enfileirado pelo ``users.mail.OutboxEmailBackend`` e entregue pelo
+    comando ``send_outbox``
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pendente'
+        SENT = 'sent', 'Enviado'
+        FAILED = 'failed', 'Falhou'
+
+    subject = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=254)
+    to = models.JSONField(default=list, blank=True)
+    cc = models.JSONField(default=list, blank=True)
+    bcc = models.JSONField(default=list, blank=True)
+    reply_to = models.JSONField(default=list, blank=True)
+    headers = models.JSONField(default=dict, blank=True)
+    # Listas de [conteúdo, mimetype] e [nome, conteúdo em base64, mimetype]
+    alternatives = models.JSONField(default=list, blank=True)
+    attachments = models.JSONField(default=list, blank=True)
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = 'email na fila'
+        verbose_name_plural = 'emails na fila'
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='users_outbox_due_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} -> {", ".join(self.to)}'
@@ -0,0 +1,8 @@
+"""Extensões do drf_spectacular para as classes do app"""
+
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Documenta o CachedJWTAuthentication como o JWT (Bearer) do simplejwt"""
+    target_class = 'users.authentication.CachedJWTAuthentication'
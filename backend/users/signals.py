@@ -1,14 +1,18 @@
-from django.db.models.signals import post_migrate
+from django.apps import apps
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save
 from django.dispatch import receiver
-from django.contrib.sites.models import Site
-from allauth.socialaccount.models import SocialApp
-from decouple import config
+
+# Models e simplejwt não são importados aqui: este módulo carrega no
+# UsersConfig.ready de todo worker. Os senders usam o label do model.
 
 
 @receiver(post_migrate)
 def setup_social_auth(sender, **kwargs):
     """
-    Configura automaticamente Site e Google OAuth após as migrations
+    Configura automaticamente Site e Google OAuth após as migrations.
+    Só grava no banco quando algo mudou.
     """
     # Só executa para o app 'users' (evita executar múltiplas vezes)
     if sender.name != 'users':
@@ -16,49 +20,91 @@ def setup_social_auth(sender, **kwargs):
 
     if kwargs.get('plan'):  # Skip during dry-run
             return
-    
+
     print("\n🔧 Configurando Site e Google OAuth...")
-    
+    Site = apps.get_model('sites', 'Site')
+    SocialApp = apps.get_model('socialaccount', 'SocialApp')
+
     # 1. Configura o Site
-    site, created = Site.objects.update_or_create(
-        id=1,
-        defaults={
-            'domain': 'localhost:8000',
-            'name': 'Local Development'
-        }
-    )
-    
+    site_defaults = {
+        'domain': 'localhost:8000',
+        'name': 'Local Development'
+    }
+    site, created = Site.objects.get_or_create(id=1, defaults=site_defaults)
+
     if created:
         print("✅ Site criado")
-    else:
+    elif _update_if_changed(site, site_defaults):
         print("✅ Site atualizado")
-    
-    # 2. Pega credenciais do .env
-    google_client_id = config('GOOGLE_CLIENT_ID', default='')
-    google_secret = config('GOOGLE_SECRET', default='')
-    
+    else:
+        print("✅ Site já configurado")
+
+    # 2. Pega credenciais do .env (já lidas pelas settings)
+    google_app = settings.SOCIALACCOUNT_PROVIDERS.get('google', {}).get('APP', {})
+    google_client_id = google_app.get('client_id', '')
+    google_secret = google_app.get('secret', '')
+
     if not google_client_id or not google_secret:
         print("⚠️  GOOGLE_CLIENT_ID ou GOOGLE_SECRET não encontrados no .env")
         print("   Configure essas variáveis para habilitar login com Google\n")
         return
-    
+
     # 3. Configura o Google Social App
-    social_app, created = SocialApp.objects.update_or_create(
-        provider='google',
-        defaults={
-            'name': 'Google OAuth',
-            'client_id': google_client_id,
-            'secret': google_secret,
-        }
-    )
-    
-    # 4. Associa o Site ao Social App
-    if site not in social_app.sites.all():
-        social_app.sites.add(site)
-    
-    if created:
+    app_values = {
+        'name': 'Google OAuth',
+        'client_id': google_client_id,
+        'secret': google_secret,
+    }
+    social_app = SocialApp.objects.filter(provider='google').first()
+    if social_app is None:
+        social_app = SocialApp.objects.create(provider='google', **app_values)
         print("✅ Google OAuth criado")
-    else:
+    elif _update_if_changed(social_app, app_values):
         print("✅ Google OAuth atualizado")
-    
-    print("🎉 Configuração concluída!\n")
\ No newline at end of file
+    else:
+        print("✅ Google OAuth já configurado")
+
+    # 4. Associa o Site ao Social App
+    if not social_app.sites.filter(pk=site.pk).exists():
+        social_app.sites.add(site)
+
+    print("🎉 Configuração concluída!\n")
+
+
+def _update_if_changed(instance, values):
+    """Atualiza só os campos diferentes; retorna se salvou"""
+    changed = [field for field, value in values.items() if getattr(instance, field) != value]
+    for field in changed:
+        setattr(instance, field, values[field])
+    if changed:
+        instance.save(update_fields=changed)
+    return bool(changed)
+
+
+@receiver(post_save, sender='socialaccount.SocialApp')
+@receiver(post_delete, sender='socialaccount.SocialApp')
+@receiver(m2m_changed, sender='socialaccount.SocialApp_sites')
+@receiver(post_save, sender='sites.Site')
+@receiver(post_delete, sender='sites.Site')
+def invalidate_provider_cache(sender, **kwargs):
+    """Mudanças em SocialApp/Site invalidam o cache de provedores"""
+    from .adapters import clear_provider_cache
+
+    clear_provider_cache()
+
+
+@receiver(setting_changed)
+def invalidate_provider_cache_on_settings(setting, **kwargs):
+    if setting in ('SOCIALACCOUNT_PROVIDERS', 'SITE_ID'):
+        from .adapters import clear_provider_cache
+
+        clear_provider_cache()
+
+
+@receiver(setting_changed)
+def invalidate_token_cache_on_settings(setting, **kwargs):
+    """Chave de assinatura/claims novas: tokens verificados deixam de valer"""
+    if setting in ('SIMPLE_JWT', 'SECRET_KEY'):
+        from .authentication import token_cache
+
+        token_cache.clear()
@@ -0,0 +1,116 @@
+"""
+Mede o boot de um worker em um processo novo: import do Django, settings,
+criação dos AppConfig (import do app), import dos models, ``AppConfig.ready``
+de cada app e carga dos middlewares. Usado pelo comando ``startup_report``:
+
+    python -m users.startup [--urls]
+
+Imprime o resultado em JSON no stdout.
+"""
+
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def elapsed_ms(since):
+    return round((time.perf_counter() - since) * 1000, 3)
+
+
+def max_rss_kb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS em bytes
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+def instrument_apps(AppConfig, timings):
+    """Cronometra AppConfig.create, import_models e ready de cada app"""
+    original_create = AppConfig.create.__func__
+    original_import_models = AppConfig.import_models
+
+    def create(cls, entry):
+        start = time.perf_counter()
+        app_config = original_create(cls, entry)
+        app_timings = timings.setdefault(app_config.label, {'app': app_config.name})
+        app_timings['import_ms'] = elapsed_ms(start)
+
+        original_ready = app_config.ready
+
+        def ready():
+            start = time.perf_counter()
+            original_ready()
+            app_timings['ready_ms'] = elapsed_ms(start)
+
+        app_config.ready = ready
+        return app_config
+
+    def import_models(self):
+        start = time.perf_counter()
+        original_import_models(self)
+        timings[self.label]['models_ms'] = elapsed_ms(start)
+
+    AppConfig.create = classmethod(create)
+    AppConfig.import_models = import_models
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    boot = time.perf_counter()
+    stages = {}
+
+    start = time.perf_counter()
+    import django
+    from django.apps import AppConfig
+    from django.conf import settings
+    stages['import_django_ms'] = elapsed_ms(start)
+
+    start = time.perf_counter()
+    settings.INSTALLED_APPS
+    stages['settings_ms'] = elapsed_ms(start)
+
+    timings = {}
+    instrument_apps(AppConfig, timings)
+    start = time.perf_counter()
+    django.setup(set_prefix=False)
+    stages['apps_ms'] = elapsed_ms(start)
+
+    # Como o get_wsgi_application: o handler carrega os middlewares
+    start = time.perf_counter()
+    from django.core.handlers.wsgi import WSGIHandler
+    WSGIHandler()
+    stages['middleware_ms'] = elapsed_ms(start)
+
+    if '--urls' in argv:
+        # URLconf e views só carregam na 1ª requisição
+        from django.urls import get_resolver
+
+        start = time.perf_counter()
+        get_resolver().url_patterns
+        stages['urlconf_ms'] = elapsed_ms(start)
+
+    stages['total_ms'] = elapsed_ms(boot)
+    apps = [
+        {'import_ms': 0.0, 'models_ms': 0.0, 'ready_ms': 0.0, **app_timings}
+        for app_timings in timings.values()
+    ]
+    for app in apps:
+        app['total_ms'] = round(app['import_ms'] + app['models_ms'] + app['ready_ms'], 3)
+
+    print(json.dumps({
+        'settings': settings.SETTINGS_MODULE,
+        'stages': stages,
+        'apps': apps,
+        'max_rss_kb': max_rss_kb(),
+        'modules_loaded': len(sys.modules),
+    }))
+
+
+if __name__ == '__main__':
+    main()
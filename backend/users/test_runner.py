@@ -0,0 +1,32 @@
+import os
+import tempfile
+
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Isola os testes do ambiente local: arquivo de buckets próprio (limpar
+    buckets não afeta o runserver) e sem as credenciais do Google do .env
+    (cada teste configura o app com ``google_provider``).
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._throttle_dir = tempfile.TemporaryDirectory(prefix='pets-test-')
+        providers = {
+            name: {key: value for key, value in provider.items() if key != 'APP'}
+            for name, provider in settings.SOCIALACCOUNT_PROVIDERS.items()
+        }
+        self._test_settings = override_settings(
+            THROTTLE_BUCKET_FILE=os.path.join(self._throttle_dir.name, 'throttle.bin'),
+            SOCIALACCOUNT_PROVIDERS=providers,
+        )
+        self._test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._test_settings.disable()
+        self._throttle_dir.cleanup()
+        super().teardown_test_environment(**kwargs)
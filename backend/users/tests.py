@@ -1,13 +1,53 @@
-from django.test import TestCase
+import gzip
+import importlib
+import io
+import json
+import os
+import runpy
+import shutil
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+import brotli
+
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.mail import EmailMultiAlternatives, send_mail
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.contrib.auth import get_user_model
-from rest_framework.test import APIClient
+from django.db import IntegrityError, connection
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.urls import resolve, reverse
+from django.utils import timezone
+from allauth.account.models import EmailAddress
+from allauth.socialaccount.models import SocialAccount, SocialApp, SocialToken
+from django.contrib.sessions.models import Session
+from django.contrib.sites.models import Site
+from rest_framework.test import APIClient, APIRequestFactory
 from rest_framework import status
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken, Token
+from .adapters import VERSION_CACHE_KEY, clear_provider_cache, get_provider_app
+from .authentication import CachedJWTAuthentication, VerifiedTokenCache, token_cache
+from .checks import check_session_cache
+from .compression import CompressionMiddleware, choose_encoding
+from .mail import drain_outbox, outbox_to_message
+from .models import OutboxEmail
+from .throttling import SharedTokenBucket, get_bucket
 
 User = get_user_model()
 
 
 class AuthenticationTests(TestCase):
     def setUp(self):
+        get_bucket().clear()
         self.client = APIClient()
         self.register_url = '/api/auth/registration/'
         self.login_url = '/api/auth/login/'
@@ -55,4 +95,682 @@ class AuthenticationTests(TestCase):
         }
         response = self.client.post(self.login_url, data)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('access', response.data)
\ No newline at end of file
+        self.assertIn('access', response.data)
+
+def google_provider(client_id='id', secret='secret'):
+    """Configura o app do Google em SOCIALACCOUNT_PROVIDERS"""
+    providers = {'google': {**settings.SOCIALACCOUNT_PROVIDERS['google'], 'APP': {'client_id': client_id, 'secret': secret, 'key': ''}}}
+    return override_settings(SOCIALACCOUNT_PROVIDERS=providers)
+
+
+class GoogleFirstLoginConcurrencyTests(TransactionTestCase):
+    """Logins simultâneos de um usuário novo via Google"""
+
+    url = '/api/auth/google/callback/'
+    concurrent_logins = 12
+
+    def setUp(self):
+        get_bucket().clear()
+        self.user_info = {
+            'id': 'google-uid-123',
+            'email': 'novo@example.com',
+            'given_name': 'Novo',
+            'family_name': 'Usuário',
+        }
+
+    def fake_google(self):
+        token = mock.Mock(status_code=200)
+        token.json.return_value = {'access_token': 'google-access', 'expires_in': 3600}
+        userinfo = mock.Mock(status_code=200)
+        userinfo.json.return_value = self.user_info
+        return (
+            mock.patch('requests.post', return_value=token),
+            mock.patch('requests.get', return_value=userinfo),
+        )
+
+    def login(self, barrier, results):
+        client = APIClient()
+        try:
+            barrier.wait()
+            start = time.perf_counter()
+            response = client.post(self.url, {'code': 'abc', 'redirect_uri': 'http://localhost'}, format='json')
+            results.append((response.status_code, time.perf_counter() - start))
+        finally:
+            connection.close()
+
+    def test_concurrent_first_logins_create_single_account(self):
+        barrier = threading.Barrier(self.concurrent_logins)
+        results = []
+        post_patch, get_patch = self.fake_google()
+        with post_patch, get_patch, google_provider():
+            threads = [
+                threading.Thread(target=self.login, args=(barrier, results))
+                for _ in range(self.concurrent_logins)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        statuses = [status_code for status_code, _ in results]
+        self.assertEqual(statuses, [status.HTTP_200_OK] * self.concurrent_logins)
+        self.assertEqual(User.objects.filter(email__iexact='novo@example.com').count(), 1)
+        self.assertEqual(SocialAccount.objects.filter(provider='google', uid='google-uid-123').count(), 1)
+        self.assertEqual(SocialToken.objects.count(), 1)
+        self.assertEqual(EmailAddress.objects.filter(email__iexact='novo@example.com').count(), 1)
+
+        latencies = sorted(latency for _, latency in results)
+        self.assertLess(latencies[-1], 5.0)
+
+    def test_first_login_links_existing_email_case_insensitively(self):
+        user = User.objects.create_user(username='existente', email='Novo@Example.com', password='testpass123')
+        post_patch, get_patch = self.fake_google()
+        with post_patch, get_patch, google_provider():
+            response = APIClient().post(self.url, {'code': 'abc'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(SocialAccount.objects.get(uid='google-uid-123').user, user)
+        self.assertEqual(User.objects.count(), 1)
+
+
+class GoogleUserCreationTests(TestCase):
+    def test_username_retries_are_bounded(self):
+        from .views import GOOGLE_USER_CREATE_ATTEMPTS, _get_or_create_google_user
+
+        with mock.patch.object(User.objects, 'create_user', side_effect=IntegrityError) as create_user:
+            with self.assertRaises(IntegrityError):
+                _get_or_create_google_user('novo@example.com', {})
+        self.assertEqual(create_user.call_count, GOOGLE_USER_CREATE_ATTEMPTS)
+
+    def test_google_login_with_taken_usernames(self):
+        for suffix in ['', *range(1, 10)]:
+            User.objects.create_user(username=f'joao{suffix}', email=f'joao{suffix}@example.com')
+        User.objects.create_user(username='joaozinho', email='joaozinho@example.com')
+        get_bucket().clear()
+        token = mock.Mock(status_code=200)
+        token.json.return_value = {'access_token': 'google-access', 'expires_in': 3600}
+        userinfo = mock.Mock(status_code=200)
+        userinfo.json.return_value = {'id': 'google-uid-joao', 'email': 'joao@outro.com'}
+
+        with mock.patch('requests.post', return_value=token), mock.patch('requests.get', return_value=userinfo), google_provider():
+            response = APIClient().post(
+                '/api/auth/google/callback/', {'code': 'abc', 'redirect_uri': 'http://localhost'}, format='json'
+            )
+
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(User.objects.get(email='joao@outro.com').username, 'joao10')
+
+    def test_migration_merges_case_duplicate_emails(self):
+        from django.apps import apps
+
+        migration = importlib.import_module('users.migrations.0002_customuser_email_ci_unique')
+        with connection.cursor() as cursor:
+            # Simula um banco anterior à constraint (desfeito no rollback do teste)
+            cursor.execute('DROP INDEX users_customuser_email_ci_unique')
+        keeper = User.objects.create_user(username='antigo', email='dono@example.com')
+        duplicate = User.objects.create_user(username='novo', email='Dono@Example.com')
+        SocialAccount.objects.create(user=duplicate, provider='google', uid='uid-dup')
+        EmailAddress.objects.create(user=duplicate, email='dono@example.com', primary=True)
+
+        with mock.patch('builtins.print'):
+            migration.merge_case_duplicate_emails(apps, None)
+
+        duplicate.refresh_from_db()
+        self.assertEqual(duplicate.email, '')
+        self.assertEqual(SocialAccount.objects.get(uid='uid-dup').user, keeper)
+        address = EmailAddress.objects.get(email='dono@example.com')
+        self.assertEqual((address.user, address.primary), (keeper, False))
+
+
+def throttle_rates(**rates):
+    """Sobrescreve as taxas de throttling mantendo o restante do REST_FRAMEWORK"""
+    return override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates})
+
+
+class SharedTokenBucketTests(TestCase):
+    def setUp(self):
+        self.bucket = SharedTokenBucket(os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'buckets.bin'), 64)
+
+    @skipUnless(hasattr(os, 'O_NOFOLLOW'), 'O_NOFOLLOW indisponível')
+    def test_does_not_follow_symlink(self):
+        directory = self.enterContext(tempfile.TemporaryDirectory())
+        target = os.path.join(directory, 'alvo')
+        with open(target, 'wb'):
+            pass
+        os.symlink(target, os.path.join(directory, 'link.bin'))
+
+        with self.assertRaises(OSError):
+            SharedTokenBucket(os.path.join(directory, 'link.bin'), 64).consume('k', 1, 1.0)
+        self.assertEqual(os.path.getsize(target), 0)
+
+    def test_allows_burst_up_to_capacity(self):
+        results = [self.bucket.consume('login:1.2.3.4', 3, 1 / 60, now=100.0)[0] for _ in range(4)]
+        self.assertEqual(results, [True, True, True, False])
+
+    def test_refills_over_time(self):
+        for _ in range(2):
+            self.bucket.consume('k', 2, 1.0, now=100.0)
+        allowed, wait = self.bucket.consume('k', 2, 1.0, now=100.0)
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(wait, 1.0)
+        self.assertTrue(self.bucket.consume('k', 2, 1.0, now=101.0)[0])
+
+    def test_keys_are_independent(self):
+        self.bucket.consume('a', 1, 1.0, now=100.0)
+        self.assertFalse(self.bucket.consume('a', 1, 1.0, now=100.0)[0])
+        self.assertTrue(self.bucket.consume('b', 1, 1.0, now=100.0)[0])
+
+    def test_state_is_shared_through_the_file(self):
+        other = SharedTokenBucket(self.bucket.path, 64)
+        self.bucket.consume('a', 1, 1.0, now=100.0)
+        self.assertFalse(other.consume('a', 1, 1.0, now=100.0)[0])
+
+
+class AuthThrottlingTests(TestCase):
+    login_url = '/api/auth/login/'
+
+    def setUp(self):
+        get_bucket().clear()
+        User.objects.create_user(username='testuser', email='test@example.com', password='testpass123')
+
+    def login(self, email='test@example.com', ip='10.0.0.1'):
+        # Cliente novo a cada tentativa: sem cookie de sessão do login anterior
+        return APIClient().post(self.login_url, {'email': email, 'password': 'testpass123'}, REMOTE_ADDR=ip)
+
+    def test_login_throttled_per_ip_before_db_work(self):
+        with throttle_rates(login='2/min'):
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+            self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+            with self.assertNumQueries(0):
+                response = self.login()
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response.headers)
+
+    def test_spoofed_forwarded_for_does_not_bypass_ip_limit(self):
+        with throttle_rates(login='2/min'):
+            statuses = [
+                APIClient().post(
+                    self.login_url,
+                    {'email': 'test@example.com', 'password': 'testpass123'},
+                    REMOTE_ADDR='10.0.0.1',
+                    HTTP_X_FORWARDED_FOR=f'203.0.113.{index}',
+                ).status_code
+                for index in range(4)
+            ]
+        self.assertEqual(statuses.count(status.HTTP_429_TOO_MANY_REQUESTS), 2)
+
+    def test_forwarded_for_is_used_behind_configured_proxies(self):
+        rest_framework = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        rest_framework['DEFAULT_THROTTLE_RATES'] = {'login': '1/min'}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            for client_ip in ('203.0.113.1', '203.0.113.2'):
+                response = APIClient().post(
+                    self.login_url,
+                    {'email': 'test@example.com', 'password': 'testpass123'},
+                    REMOTE_ADDR='10.0.0.1',
+                    HTTP_X_FORWARDED_FOR=f'spoofed, {client_ip}',
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_login_and_registration_routes_keep_trailing_slash(self):
+        self.assertEqual(reverse('rest_login'), '/api/auth/login/')
+        self.assertEqual(reverse('rest_register'), '/api/auth/registration/')
+        self.assertEqual(resolve('/api/auth/login/').func.view_initkwargs['throttle_scope'], 'login')
+        # Sem a barra não há rota: o CommonMiddleware redireciona
+        self.assertEqual(APIClient().post('/api/auth/login', {}).status_code, status.HTTP_301_MOVED_PERMANENTLY)
+
+    def test_bucket_file_is_isolated_for_tests(self):
+        self.assertNotEqual(settings.THROTTLE_BUCKET_FILE, str(settings.BASE_DIR / 'throttle-buckets.bin'))
+
+    def test_login_throttled_per_identifier_across_ips(self):
+        with throttle_rates(login_identifier='1/min'):
+            self.assertEqual(self.login(ip='10.0.0.1').status_code, status.HTTP_200_OK)
+            self.assertEqual(self.login(ip='10.0.0.2').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            self.assertEqual(self.login(email='other@example.com', ip='10.0.0.3').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_scope_without_rate_is_not_throttled(self):
+        with throttle_rates():
+            for _ in range(5):
+                self.assertEqual(self.login().status_code, status.HTTP_200_OK)
+
+
+class FakeSMTPHandler(socketserver.StreamRequestHandler):
+    """Servidor SMTP mínimo: aceita tudo e guarda as mensagens recebidas"""
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply('220 localhost ESMTP')
+        while line := self.rfile.readline():
+            command = line.decode().strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250 localhost')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                lines = []
+                while (data := self.rfile.readline()) != b'.\r\n':
+                    lines.append(data)
+                self.server.messages.append(b''.join(lines))
+                self.reply('250 OK')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+    def reply(self, text):
+        self.wfile.write(f'{text}\r\n'.encode())
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), FakeSMTPHandler)
+        self.connections = 0
+        self.messages = []
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+@override_settings(EMAIL_BACKEND='users.mail.OutboxEmailBackend')
+class EmailOutboxTests(TestCase):
+    def setUp(self):
+        get_bucket().clear()
+
+    def smtp_settings(self, port):
+        return override_settings(
+            EMAIL_DELIVERY_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+            EMAIL_HOST='127.0.0.1',
+            EMAIL_PORT=port,
+            EMAIL_USE_TLS=False,
+            EMAIL_HOST_USER='',
+            EMAIL_TIMEOUT=2,
+        )
+
+    def test_backend_only_enqueues(self):
+        message = EmailMultiAlternatives('Olá', 'texto', 'from@example.com', ['to@example.com'])
+        message.attach_alternative('<p>html</p>', 'text/html')
+        message.attach('a.txt', b'conteudo', 'text/plain')
+        message.send()
+
+        email = OutboxEmail.objects.get()
+        self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+        self.assertEqual(email.to, ['to@example.com'])
+        self.assertEqual(email.alternatives, [['<p>html</p>', 'text/html']])
+        self.assertEqual(mail.outbox, [])
+
+        rebuilt = outbox_to_message(email)
+        self.assertEqual(rebuilt.alternatives[0][0], '<p>html</p>')
+        self.assertEqual(rebuilt.attachments[0][1], 'conteudo')
+
+    def test_signup_enqueues_confirmation_email(self):
+        response = APIClient().post('/api/auth/registration/', {
+            'username': 'novo',
+            'email': 'novo@example.com',
+            'password1': 'Senha-forte-123',
+            'password2': 'Senha-forte-123',
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(OutboxEmail.objects.filter(to=['novo@example.com']).count(), 1)
+
+    def test_send_outbox_delivers_batches_over_one_connection(self):
+        for index in range(5):
+            send_mail(f'Assunto {index}', 'corpo', 'from@example.com', [f'to{index}@example.com'])
+
+        with FakeSMTPServer() as server, self.smtp_settings(server.server_address[1]):
+            call_command('send_outbox', batch_size=2, stdout=io.StringIO())
+
+        self.assertEqual(len(server.messages), 5)
+        self.assertEqual(server.connections, 1)
+        self.assertFalse(OutboxEmail.objects.exclude(status=OutboxEmail.Status.SENT).exists())
+
+    def test_failed_delivery_is_retried_with_backoff(self):
+        send_mail('Assunto', 'corpo', 'from@example.com', ['to@example.com'])
+        with FakeSMTPServer() as server:
+            port = server.server_address[1]
+        # Servidor já encerrado: conexão recusada
+
+        with self.smtp_settings(port), override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2, EMAIL_OUTBOX_RETRY_DELAY=60):
+            self.assertEqual(drain_outbox(), (0, 1))
+            email = OutboxEmail.objects.get()
+            self.assertEqual(email.status, OutboxEmail.Status.PENDING)
+            self.assertEqual(email.attempts, 1)
+            self.assertGreater(email.next_attempt_at, timezone.now() + timedelta(seconds=50))
+            self.assertIn('ConnectionRefusedError', email.last_error)
+
+            # Ainda não venceu: nada é tentado
+            self.assertEqual(drain_outbox(), (0, 0))
+
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+            self.assertEqual(drain_outbox(), (0, 1))
+            self.assertEqual(OutboxEmail.objects.get().status, OutboxEmail.Status.FAILED)
+
+
+class ProviderConfigCacheTests(TestCase):
+    def setUp(self):
+        clear_provider_cache()
+        self.site = Site.objects.get_current()
+
+    def test_provider_app_is_cached_per_process(self):
+        with google_provider(client_id='settings-id'):
+            self.assertEqual(get_provider_app('google').client_id, 'settings-id')
+            with self.assertNumQueries(0):
+                self.assertEqual(get_provider_app('google').client_id, 'settings-id')
+
+    def test_database_and_settings_apps_with_same_client_id_are_merged(self):
+        app = SocialApp.objects.create(provider='google', name='Google', client_id='same-id', secret='db-secret')
+        app.sites.add(self.site)
+        with google_provider(client_id='same-id', secret='settings-secret'):
+            self.assertEqual(get_provider_app('google').secret, 'settings-secret')
+
+    def test_settings_app_wins_over_database_app_with_other_client_id(self):
+        app = SocialApp.objects.create(provider='google', name='Google', client_id='db-id', secret='db-secret')
+        app.sites.add(self.site)
+        token = mock.Mock(status_code=400)
+        with google_provider(client_id='rotated-id', secret='settings-secret'), \
+                mock.patch('requests.post', return_value=token) as post:
+            # Credenciais trocadas no .env valem sem rodar o migrate
+            self.assertEqual(get_provider_app('google').client_id, 'rotated-id')
+            response = APIClient().post('/api/auth/google/callback/', {'code': 'abc'}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(post.call_args.kwargs['data']['client_id'], 'rotated-id')
+
+    def test_database_app_is_used_without_settings_credentials(self):
+        app = SocialApp.objects.create(provider='google', name='Google', client_id='db-id', secret='db-secret')
+        app.sites.add(self.site)
+        with google_provider(client_id='', secret=''):
+            self.assertEqual(get_provider_app('google').client_id, 'db-id')
+
+    def test_change_in_other_worker_invalidates_through_shared_version(self):
+        app = SocialApp.objects.create(provider='google', name='Google', client_id='db-id', secret='old')
+        app.sites.add(self.site)
+        with google_provider(client_id=''):
+            get_provider_app('google')
+            # Outro worker salvou o app: só a versão no cache compartilhado muda
+            SocialApp.objects.filter(pk=app.pk).update(secret='new')
+            cache.set(VERSION_CACHE_KEY, 'outro-worker')
+            self.assertEqual(get_provider_app('google').secret, 'new')
+
+    def test_save_publishes_new_version_on_commit(self):
+        version = cache.get(VERSION_CACHE_KEY)
+        with self.captureOnCommitCallbacks(execute=True):
+            SocialApp.objects.create(provider='google', name='Google', client_id='db-id')
+        self.assertNotEqual(cache.get(VERSION_CACHE_KEY), version)
+
+    def test_entries_expire_after_ttl(self):
+        app = SocialApp.objects.create(provider='google', name='Google', client_id='db-id', secret='old')
+        app.sites.add(self.site)
+        with google_provider(client_id=''), override_settings(SOCIAL_APP_CACHE_TTL=60):
+            get_provider_app('google')
+            SocialApp.objects.filter(pk=app.pk).update(secret='new')
+            self.assertEqual(get_provider_app('google').secret, 'old')
+            with mock.patch('users.adapters.time.monotonic', return_value=time.monotonic() + 61):
+                self.assertEqual(get_provider_app('google').secret, 'new')
+
+    def test_changes_invalidate_cache(self):
+        app = SocialApp.objects.create(provider='google', name='Google', client_id='db-id', secret='old')
+        app.sites.add(self.site)
+        with google_provider(client_id=''):
+            self.assertEqual(get_provider_app('google').secret, 'old')
+
+            app.secret = 'new'
+            app.save()
+            self.assertEqual(get_provider_app('google').secret, 'new')
+
+            app.sites.remove(self.site)
+            with self.assertRaises(SocialApp.DoesNotExist):
+                get_provider_app('google')
+
+    def test_google_auth_uses_cached_credentials(self):
+        token = mock.Mock(status_code=400)
+        with google_provider(client_id='cached-id', secret='cached-secret'), \
+                mock.patch('requests.post', return_value=token) as post:
+            APIClient().post('/api/auth/google/callback/', {'code': 'abc'}, format='json')
+
+        self.assertEqual(post.call_args.kwargs['data']['client_id'], 'cached-id')
+        self.assertEqual(post.call_args.kwargs['data']['client_secret'], 'cached-secret')
+
+    def test_google_auth_without_configuration(self):
+        with google_provider(client_id=''):
+            response = APIClient().post('/api/auth/google/callback/', {'code': 'abc'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+class PurgeSessionsTests(TestCase):
+    def create_sessions(self, count, expire_date):
+        Session.objects.bulk_create(
+            Session(session_key=f'{expire_date.timestamp()}-{index}', session_data='', expire_date=expire_date)
+            for index in range(count)
+        )
+
+    def test_deletes_only_expired_sessions_in_batches(self):
+        self.create_sessions(7, timezone.now() - timedelta(days=1))
+        self.create_sessions(3, timezone.now() + timedelta(days=1))
+
+        out = io.StringIO()
+        with mock.patch('users.management.commands.purge_sessions.time.sleep') as sleep:
+            call_command('purge_sessions', batch_size=3, sleep=0.5, stdout=out)
+
+        self.assertEqual(Session.objects.count(), 3)
+        self.assertFalse(Session.objects.filter(expire_date__lt=timezone.now()).exists())
+        self.assertIn('7 sessão(ões)', out.getvalue())
+        # Lotes de 3, 3 e 1: pausa entre os lotes cheios
+        self.assertEqual(sleep.call_count, 2)
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_signed_cookies_have_nothing_to_purge(self):
+        self.create_sessions(2, timezone.now() - timedelta(days=1))
+        out = io.StringIO()
+        call_command('purge_sessions', stdout=out)
+        self.assertEqual(Session.objects.count(), 2)
+        self.assertIn('Nada a apagar', out.getvalue())
+
+
+class SessionModeTests(TestCase):
+    cached_db = 'django.contrib.sessions.backends.cached_db'
+    locmem = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    shared = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost'}}
+
+    def test_unknown_session_mode_lists_valid_modes(self):
+        with mock.patch.dict(os.environ, {'SESSION_MODE': 'cache_db'}):
+            with self.assertRaisesMessage(ImproperlyConfigured, 'db, cached_db, signed_cookies'):
+                runpy.run_path(str(settings.BASE_DIR / 'core' / 'settings.py'))
+
+    def test_cached_db_requires_shared_cache_outside_debug(self):
+        with override_settings(SESSION_ENGINE=self.cached_db, CACHES=self.locmem, DEBUG=False):
+            self.assertEqual([error.id for error in check_session_cache(None)], ['users.E001'])
+        with override_settings(SESSION_ENGINE=self.cached_db, CACHES=self.locmem, DEBUG=True):
+            self.assertEqual(check_session_cache(None), [])
+        with override_settings(SESSION_ENGINE=self.cached_db, CACHES=self.shared, DEBUG=False):
+            self.assertEqual(check_session_cache(None), [])
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    profile_url = '/api/profile/'
+
+    def setUp(self):
+        token_cache.clear()
+        self.user = User.objects.create_user(username='jwtuser', email='jwt@example.com', password='testpass123')
+        self.access = str(RefreshToken.for_user(self.user).access_token)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+
+    def test_repeated_token_is_verified_once(self):
+        with mock.patch('rest_framework_simplejwt.tokens.Token.verify', autospec=True, side_effect=Token.verify) as verify:
+            for _ in range(3):
+                self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_200_OK)
+        self.assertEqual(verify.call_count, 1)
+
+    def test_entry_is_never_served_after_exp(self):
+        self.client.get(self.profile_url)
+        expires_at = AccessToken(self.access)['exp']
+
+        with mock.patch('users.authentication.time.time', return_value=expires_at + 1), \
+                mock.patch('rest_framework_simplejwt.tokens.Token.verify', autospec=True, side_effect=Token.verify) as verify:
+            self.client.get(self.profile_url)
+        self.assertEqual(verify.call_count, 1)
+
+    def test_inactive_user_is_rejected_with_cached_token(self):
+        self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_200_OK)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_invalid_token_is_not_cached(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer invalido')
+        self.assertEqual(self.client.get(self.profile_url).status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(len(token_cache), 0)
+
+    def test_schema_documents_bearer_auth(self):
+        from drf_spectacular.extensions import OpenApiAuthenticationExtension
+
+        self.assertIsNotNone(OpenApiAuthenticationExtension.get_match(CachedJWTAuthentication()))
+
+    def test_cache_is_bounded(self):
+        cache = VerifiedTokenCache(max_size=2)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, key, expires_at=time.time() + 60)
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c'), 'c')
+
+
+@override_settings(COMPRESSION_MIN_SIZE=100)
+class CompressionTests(TestCase):
+    body = b'{"pets": [' + b', '.join(b'{"nome": "Rex", "especie": "cachorro"}' for _ in range(50)) + b']}'
+
+    def compressed(self, response, accept_encoding='gzip'):
+        request = APIRequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def json_response(self, body=None):
+        return HttpResponse(self.body if body is None else body, content_type='application/json')
+
+    def test_negotiates_encoding(self):
+        self.assertEqual(choose_encoding('gzip, deflate'), 'gzip')
+        self.assertIsNone(choose_encoding('gzip;q=0, identity'))
+        self.assertIsNone(choose_encoding(''))
+        with mock.patch('users.compression.brotli', None):
+            self.assertEqual(choose_encoding('br, gzip;q=0.5'), 'gzip')
+
+    def test_compresses_json_above_threshold(self):
+        response = self.compressed(self.json_response())
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+    def test_prefers_brotli_and_round_trips(self):
+        self.assertEqual(choose_encoding('gzip, deflate, br'), 'br')
+        response = self.compressed(self.json_response(), accept_encoding='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+
+    def test_streaming_response_round_trips_brotli(self):
+        chunks = [self.body[i:i + 200] for i in range(0, len(self.body), 200)]
+        response = self.compressed(StreamingHttpResponse(iter(chunks), content_type='application/json'), 'br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(b''.join(response.streaming_content)), self.body)
+
+    def test_skips_small_binary_and_encoded_responses(self):
+        small = self.compressed(self.json_response(b'{}'))
+        image = self.compressed(HttpResponse(self.body, content_type='image/png'))
+        encoded = self.json_response()
+        encoded['Content-Encoding'] = 'identity'
+        for response in (small, image, self.compressed(encoded)):
+            self.assertNotEqual(response.get('Content-Encoding'), 'gzip')
+
+    def test_streaming_response_is_compressed_chunk_by_chunk(self):
+        chunks = [self.body[i:i + 200] for i in range(0, len(self.body), 200)]
+        response = self.compressed(StreamingHttpResponse(iter(chunks), content_type='text/event-stream'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        parts = list(response.streaming_content)
+        self.assertGreater(len(parts), len(chunks))
+        self.assertEqual(gzip.decompress(b''.join(parts)), self.body)
+
+    def test_schema_endpoint_is_compressed(self):
+        response = self.client.get('/api/schema/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn(b'openapi', gzip.decompress(response.content))
+
+    def test_collectstatic_writes_precompressed_siblings(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        with override_settings(STATIC_ROOT=static_root):
+            call_command('collectstatic', interactive=False, verbosity=0)
+            css = os.path.join(static_root, 'admin', 'css', 'base.css')
+            with open(css, 'rb') as original, open(css + '.gz', 'rb') as gz, open(css + '.br', 'rb') as br:
+                content = original.read()
+                self.assertEqual(gzip.decompress(gz.read()), content)
+                self.assertEqual(brotli.decompress(br.read()), content)
+
+            # Irmãos em dia não são refeitos no próximo collectstatic
+            generated_at = os.path.getmtime(css + '.gz')
+            call_command('collectstatic', interactive=False, verbosity=0)
+            self.assertEqual(os.path.getmtime(css + '.gz'), generated_at)
+
+            # O FileResponse do arquivo é trocado pelo irmão pré-comprimido
+            from django.views.static import serve
+
+            request = APIRequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip')
+            middleware = CompressionMiddleware(lambda request: serve(request, 'admin/css/base.css', static_root))
+            response = middleware(request)
+            self.assertEqual(response['Content-Encoding'], 'gzip')
+            self.assertEqual(int(response['Content-Length']), os.path.getsize(css + '.gz'))
+            self.assertEqual(response['Content-Type'], 'text/css')
+            self.assertEqual(response['Content-Disposition'], 'inline; filename="base.css"')
+            with open(css, 'rb') as original:
+                self.assertEqual(gzip.decompress(b''.join(response.streaming_content)), original.read())
+            response.close()
+
+            # FileResponse direto, com o irmão .br
+            request = APIRequestFactory().get('/', HTTP_ACCEPT_ENCODING='br')
+            middleware = CompressionMiddleware(lambda request: FileResponse(open(css, 'rb')))
+            response = middleware(request)
+            self.assertEqual(response['Content-Encoding'], 'br')
+            self.assertEqual(int(response['Content-Length']), os.path.getsize(css + '.br'))
+            self.assertEqual(response['Content-Type'], 'text/css')
+            self.assertEqual(response['Content-Disposition'], 'inline; filename="base.css"')
+            with open(css, 'rb') as original:
+                self.assertEqual(brotli.decompress(b''.join(response.streaming_content)), original.read())
+            response.close()
+
+
+class StartupProfileTests(TestCase):
+    def prod_settings(self, **env):
+        with mock.patch.dict(os.environ, {'ALLOWED_HOSTS': 'api.example.com', **env}):
+            import core.settings_prod
+            return importlib.reload(core.settings_prod)
+
+    def test_production_profile_drops_dev_only_apps(self):
+        prod = self.prod_settings()
+        self.assertNotIn('django_extensions', prod.INSTALLED_APPS)
+        self.assertNotIn('drf_spectacular', prod.INSTALLED_APPS)
+        self.assertEqual(prod.REST_FRAMEWORK['DEFAULT_SCHEMA_CLASS'], 'rest_framework.schemas.openapi.AutoSchema')
+        self.assertIn('users', prod.INSTALLED_APPS)
+
+    def test_production_profile_can_keep_api_docs(self):
+        prod = self.prod_settings(API_DOCS_ENABLED='True')
+        self.assertIn('drf_spectacular', prod.INSTALLED_APPS)
+        self.assertNotIn('django_extensions', prod.INSTALLED_APPS)
+
+    def test_startup_report(self):
+        out = io.StringIO()
+        call_command('startup_report', runs=1, top=5, json=True, stdout=out)
+        report = json.loads(out.getvalue())
+
+        apps = {app['app']: app for app in report['apps']}
+        self.assertIn('ready_ms', apps['users'])
+        self.assertGreater(report['stages']['total_ms'], report['stages']['apps_ms'])
+        self.assertEqual(len(report['imports']['packages']), 5)
+        self.assertIn('django', [package['package'] for package in report['imports']['packages']])
+        if sys.platform != 'win32':
+            self.assertGreater(report['max_rss_kb'], 0)
@@ -0,0 +1,208 @@
+"""
+Throttling das rotas de autenticação com token bucket em memória compartilhada.
+
+Os buckets ficam em um arquivo mapeado em memória (``mmap``) compartilhado por
+todos os workers do mesmo host, então o limite vale para o host inteiro sem
+consultar o cache ou o banco a cada requisição. O throttle roda no
+``initial()`` do DRF, antes do serializer: requisições acima do limite são
+rejeitadas antes de qualquer hash de senha, query ou chamada ao Google.
+
+As taxas seguem o formato do DRF (``'10/min'``) em
+``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']``, usando o ``throttle_scope`` da
+view. Escopos sem taxa configurada não são limitados.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem lock entre processos, só entre threads
+    fcntl = None
+
+# Slot: hash da chave, tokens disponíveis, instante da última atualização
+_SLOT = struct.Struct('<Qdd')
+# Slots vizinhos examinados antes de reaproveitar o bucket mais antigo
+_PROBE = 4
+_DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+_buckets_lock = threading.Lock()
+
+
+def parse_rate(rate):
+    """Converte ``'10/min'`` em (capacidade, duração em segundos)"""
+    num, period = rate.split('/')
+    return int(num), _DURATIONS[period[0]]
+
+
+class SharedTokenBucket:
+    """Tabela de token buckets em um arquivo mapeado em memória"""
+
+    def __init__(self, path, slots):
+        self.path = str(path)
+        self.slots = slots
+        self._pid = None
+        self._fd = None
+        self._buffer = None
+        self._thread_lock = threading.Lock()
+
+    def _open(self):
+        # Reabre após fork: locks fcntl pertencem ao processo
+        size = self.slots * _SLOT.size
+        # O_NOFOLLOW: não segue um symlink plantado no lugar do arquivo
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | getattr(os, 'O_NOFOLLOW', 0), 0o600)
+        if os.fstat(fd).st_size < size:
+            os.ftruncate(fd, size)
+        self._fd = fd
+        self._buffer = mmap.mmap(fd, size)
+        self._thread_lock = threading.Lock()
+        self._pid = os.getpid()
+
+    @contextmanager
+    def _locked(self):
+        if self._pid != os.getpid():
+            with _buckets_lock:
+                if self._pid != os.getpid():
+                    self._open()
+        with self._thread_lock:
+            if fcntl:
+                fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                yield self._buffer
+            finally:
+                if fcntl:
+                    fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def consume(self, key, capacity, refill_per_second, now=None):
+        """
+        Consome um token do bucket ``key``.
+
+        Retorna (permitido, segundos até o próximo token).
+        """
+        now = time.time() if now is None else now
+        digest = hashlib.blake2b(key.encode(), digest_size=8).digest()
+        key_hash = int.from_bytes(digest, 'little') or 1
+
+        with self._locked() as buffer:
+            start = key_hash % self.slots
+            offset = None
+            victim, victim_updated = None, None
+            for probe in range(_PROBE):
+                candidate = ((start + probe) % self.slots) * _SLOT.size
+                slot_hash, tokens, updated = _SLOT.unpack_from(buffer, candidate)
+                if slot_hash == key_hash:
+                    offset = candidate
+                    break
+                if victim is None or updated < victim_updated:
+                    victim, victim_updated = candidate, updated
+
+            if offset is None:
+                # Bucket novo começa cheio, no slot vazio ou menos recente
+                offset, tokens, updated = victim, float(capacity), now
+
+            tokens = min(float(capacity), tokens + max(0.0, now - updated) * refill_per_second)
+            if tokens >= 1:
+                allowed, wait = True, None
+                tokens -= 1
+            else:
+                allowed, wait = False, (1 - tokens) / refill_per_second
+            _SLOT.pack_into(buffer, offset, key_hash, tokens, now)
+
+        return allowed, wait
+
+    def clear(self):
+        """Esvazia todos os buckets"""
+        with self._locked() as buffer:
+            buffer[:] = bytes(len(buffer))
+
+
+_buckets = {}
+
+
+def get_bucket():
+    """Tabela de buckets configurada nas settings (uma por processo)"""
+    key = (str(settings.THROTTLE_BUCKET_FILE), settings.THROTTLE_BUCKET_SLOTS)
+    bucket = _buckets.get(key)
+    if bucket is None:
+        with _buckets_lock:
+            bucket = _buckets.setdefault(key, SharedTokenBucket(*key))
+    return bucket
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle base: o escopo vem de ``scope`` ou do ``throttle_scope`` da view,
+    e a taxa de ``DEFAULT_THROTTLE_RATES[escopo + scope_suffix]``.
+    """
+
+    scope = None
+    scope_suffix = ''
+
+    def __init__(self):
+        self._wait = None
+
+    def get_key(self, request):
+        """Identifica o bucket da requisição (``None`` não limita)"""
+        raise NotImplementedError('.get_key() must be overridden')
+
+    def allow_request(self, request, view):
+        scope = self.scope or getattr(view, 'throttle_scope', None)
+        if not scope:
+            return True
+
+        scope = f'{scope}{self.scope_suffix}'
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if not rate:
+            return True
+
+        key = self.get_key(request)
+        if key is None:
+            return True
+
+        capacity, duration = parse_rate(rate)
+        allowed, self._wait = get_bucket().consume(f'{scope}:{key}', capacity, capacity / duration)
+        return allowed
+
+    def wait(self):
+        return self._wait
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Limita por IP de origem"""
+
+    def get_key(self, request):
+        return self.get_ident(request)
+
+
+class IdentifierTokenBucketThrottle(TokenBucketThrottle):
+    """Limita por email/username enviado no corpo, independente do IP"""
+
+    scope_suffix = '_identifier'
+    identifier_fields = ('email', 'username')
+
+    def get_key(self, request):
+        data = request.data
+        if not hasattr(data, 'get'):
+            return None
+        for field in self.identifier_fields:
+            value = data.get(field)
+            if isinstance(value, str) and value.strip():
+                return value.strip().lower()
+        return None
+
+
+class GoogleAuthThrottle(IPTokenBucketThrottle):
+    """Limita o callback do Google OAuth por IP"""
+
+    scope = 'google_auth'
+
+
+AUTH_THROTTLE_CLASSES = [IPTokenBucketThrottle, IdentifierTokenBucketThrottle]
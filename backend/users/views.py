@@ -1,15 +1,19 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Value
+from django.db.models.functions import Lower
 from django.utils import timezone
 from datetime import timedelta
 from allauth.account.models import EmailAddress
-from allauth.socialaccount.models import SocialAccount, SocialToken
-import requests
-from decouple import config
+from allauth.socialaccount.models import SocialAccount, SocialApp, SocialToken
+from .adapters import get_provider_app
 from .serializers import UserSerializer
+from .throttling import GoogleAuthThrottle
 
 
 @api_view(['GET'])
@@ -55,6 +59,7 @@ def dashboard(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([GoogleAuthThrottle])
 def google_auth(request):
     """
     Endpoint para autenticação via Google OAuth
@@ -70,11 +75,23 @@ def google_auth(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Credenciais OAuth em cache no processo (sem query nem leitura do .env)
+        try:
+            google_app = get_provider_app('google', request)
+        except SocialApp.DoesNotExist:
+            return Response(
+                {'error': 'Login com Google não configurado'},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+
+        # requests só é importado no primeiro login com Google (boot mais rápido)
+        import requests
+
         # Troca o código por um access token do Google
-        token_url = 'https://oauth2.googleapis.com/token'
+        token_url = settings.GOOGLE_TOKEN_URL
         token_data = {
-            'client_id': config('GOOGLE_CLIENT_ID'),
-            'client_secret': config('GOOGLE_SECRET'),
+            'client_id': google_app.client_id,
+            'client_secret': google_app.secret,
             'code': code,
             'grant_type': 'authorization_code',
             'redirect_uri': redirect_uri,
@@ -100,7 +117,7 @@ def google_auth(request):
             )
         
         # Obtém informações do usuário do Google
-        user_info_url = 'https://www.googleapis.com/oauth2/v2/userinfo'
+        user_info_url = settings.GOOGLE_USERINFO_URL
         user_response = requests.get(
             user_info_url, 
             headers={'Authorization': f'Bearer {access_token}'}
@@ -131,85 +148,49 @@ def google_auth(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        User = get_user_model()
-        
-        # Verifica se já existe conta Google pelo UID (ID único)
-        social_account = SocialAccount.objects.filter(
-            provider='google',
-            uid=google_id
-        ).first()
-        
-        if social_account:
-            # Usuário já fez login com Google antes
+        # Upsert idempotente: logins simultâneos do mesmo usuário resolvem
+        # os conflitos no banco em vez de checar-e-inserir
+        with transaction.atomic():
+            social_account = _upsert_google_account(google_id, email, user_info)
             user = social_account.user
+
             # Atualiza informações do usuário se necessário
-            if first_name:
+            changed = []
+            if first_name and user.first_name != first_name:
                 user.first_name = first_name
-            if last_name:
+                changed.append('first_name')
+            if last_name and user.last_name != last_name:
                 user.last_name = last_name
-            user.save()
-            
-            # Atualiza extra_data com informações mais recentes
-            social_account.extra_data = user_info
-            social_account.save()
-            
-        else:
-            # Verifica se existe usuário com esse email
-            try:
-                user = User.objects.get(email=email)
-                # Email existe, mas não tem conta Google vinculada
-                # Vamos vincular o Google a essa conta existente
-            except User.DoesNotExist:
-                # Cria novo usuário
-                username = email.split('@')[0]
-                # Garante que o username seja único
-                counter = 1
-                original_username = username
-                while User.objects.filter(username=username).exists():
-                    username = f"{original_username}{counter}"
-                    counter += 1
-                
-                user = User.objects.create_user(
-                    username=username,
-                    email=email,
-                    first_name=first_name,
-                    last_name=last_name,
-                )
-            
-            # Cria o SocialAccount
-            social_account = SocialAccount.objects.create(
+                changed.append('last_name')
+            if changed:
+                user.save(update_fields=changed)
+
+            # Gerencia EmailAddress (marca como verificado)
+            email_address, email_created = EmailAddress.objects.get_or_create(
                 user=user,
-                provider='google',
-                uid=google_id,
-                extra_data=user_info
+                email__iexact=email,
+                defaults={
+                    'email': email,
+                    'verified': True,
+                    'primary': True,
+                }
             )
-        
-        # Gerencia EmailAddress (marca como verificado)
-        email_address, email_created = EmailAddress.objects.get_or_create(
-            user=user,
-            email__iexact=email,
-            defaults={
-                'email': email,
-                'verified': True,
-                'primary': True,
-            }
-        )
-        
-        # Se o email já existia mas não estava verificado, verifica agora
-        if not email_created and not email_address.verified:
-            email_address.verified = True
-            email_address.save()
-        
-        # Guarda os tokens OAuth
-        SocialToken.objects.update_or_create(
-            account=social_account,
-            defaults={
-                'token': access_token,
-                'token_secret': refresh_token,
-                'expires_at': timezone.now() + timedelta(seconds=expires_in)
-            }
-        )
-        
+
+            # Se o email já existia mas não estava verificado, verifica agora
+            if not email_created and not email_address.verified:
+                email_address.verified = True
+                email_address.save(update_fields=['verified'])
+
+            # Guarda os tokens OAuth (a conta social está travada nesta transação)
+            SocialToken.objects.update_or_create(
+                account=social_account,
+                defaults={
+                    'token': access_token,
+                    'token_secret': refresh_token,
+                    'expires_at': timezone.now() + timedelta(seconds=expires_in)
+                }
+            )
+
         # Gera tokens JWT
         from rest_framework_simplejwt.tokens import RefreshToken
         refresh = RefreshToken.for_user(user)
@@ -224,4 +205,86 @@ def google_auth(request):
         return Response(
             {'error': f'Erro interno: {str(e)}'}, 
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+def _upsert_google_account(google_id, email, user_info):
+    """
+    Retorna a SocialAccount do Google para ``google_id``, criando usuário e
+    conta social no primeiro login. Deve ser chamada dentro de uma transação.
+
+    A inserção vem antes da leitura: conflitos em ``(provider, uid)`` e no
+    email (constraint única em ``CustomUser``) são resolvidos pelo banco, de
+    modo que requisições concorrentes convergem para a mesma conta.
+    """
+    accounts = SocialAccount.objects.select_for_update(of=('self',)).select_related('user')
+
+    social_account = accounts.filter(provider='google', uid=google_id).first()
+    if social_account:
+        # Login recorrente: só atualiza extra_data com as informações mais recentes
+        if social_account.extra_data != user_info:
+            social_account.extra_data = user_info
+            social_account.save(update_fields=['extra_data'])
+        return social_account
+
+    user = _get_or_create_google_user(email, user_info)
+
+    # INSERT ... ON CONFLICT DO NOTHING em (provider, uid)
+    SocialAccount.objects.bulk_create(
+        [SocialAccount(user=user, provider='google', uid=google_id, extra_data=user_info)],
+        ignore_conflicts=True,
+    )
+    return accounts.get(provider='google', uid=google_id)
+
+
+# Tentativas de criar o usuário; só uma corrida real no mesmo username as esgota
+GOOGLE_USER_CREATE_ATTEMPTS = 10
+
+
+def _find_user_by_email(email):
+    """Busca pelo email com o mesmo LOWER() da constraint única de CustomUser"""
+    User = get_user_model()
+    return User.objects.alias(email_ci=Lower('email')).filter(email_ci=Lower(Value(email))).first()
+
+
+def _free_username(base):
+    """Primeiro username livre da sequência base, base1, base2..."""
+    User = get_user_model()
+    taken = set(User.objects.filter(username__startswith=base).values_list('username', flat=True))
+    if base not in taken:
+        return base
+    numbers = [int(name[len(base):]) for name in taken if name[len(base):].isdigit()]
+    return f'{base}{max(numbers, default=0) + 1}'
+
+
+def _get_or_create_google_user(email, user_info):
+    """
+    Busca o usuário pelo email ou cria um novo com username único.
+
+    Se outra requisição criar o mesmo email entre a busca e a inserção, a
+    constraint única devolve IntegrityError e o usuário vencedor é usado.
+    """
+    User = get_user_model()
+
+    user = _find_user_by_email(email)
+    if user:
+        # Email existe, mas não tem conta Google vinculada: vincula a essa conta
+        return user
+
+    base_username = email.split('@')[0]
+    for attempt in range(GOOGLE_USER_CREATE_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(
+                    username=_free_username(base_username),
+                    email=email,
+                    first_name=user_info.get('given_name', ''),
+                    last_name=user_info.get('family_name', ''),
+                )
+        except IntegrityError:
+            user = _find_user_by_email(email)
+            if user:
+                return user
+            if attempt == GOOGLE_USER_CREATE_ATTEMPTS - 1:
+                raise
+            # Outra requisição pegou o mesmo username: busca o próximo livre